@@ -11,6 +11,7 @@ from typing import Dict, Optional
 import threading
 import os
 import uvicorn
+from job_scraper import get_connection, record_application_attempt
 
 DB_FILE = "jobs.db"
 
@@ -30,17 +31,14 @@ class JobAutomator:
         }
 
     def get_unapplied_jobs(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        c = get_connection().cursor()
         c.execute("""
-            SELECT link FROM jobs 
+            SELECT id, link FROM jobs 
             WHERE status = 'new' 
             AND link LIKE '%tunisietravail.net%'
             AND is_clicked = 0
         """)
-        jobs = c.fetchall()
-        conn.close()
-        return [job[0] for job in jobs]
+        return c.fetchall()
 
     def fill_education(self):
         self.driver.find_element(By.ID, "diplome_oui").click()
@@ -110,25 +108,17 @@ class JobAutomator:
             print(f"Error applying to job {job_url}: {str(e)}")
             return False
 
-    def mark_job_applied(self, job_link: str, success: bool):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        status = 'applied' if success else 'failed'
-        c.execute("""
-            UPDATE jobs 
-            SET status = ?, is_clicked = 1
-            WHERE link = ?
-        """, (status, job_link))
-        conn.commit()
-        conn.close()
+    def mark_job_applied(self, job_id: int, success: bool):
+        # Goes through the history and materialized stats like main.py's automator
+        record_application_attempt(job_id, success, "tunisietravail", clicked=True)
 
     def run_automation(self):
         jobs = self.get_unapplied_jobs()
         print(f"Found {len(jobs)} unapplied jobs")
 
-        for job_url in jobs:
+        for job_id, job_url in jobs:
             success = self.apply_to_job(job_url)
-            self.mark_job_applied(job_url, success)
+            self.mark_job_applied(job_id, success)
             time.sleep(2)
 
     def close(self):
@@ -186,11 +176,9 @@ async def stop_automation():
 
 def get_applied_count():
     try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
+        c = get_connection().cursor()
         c.execute("SELECT COUNT(*) FROM jobs WHERE status = 'applied'")
         count = c.fetchone()[0]
-        conn.close()
         return count
     except sqlite3.Error:
         return 0
@@ -0,0 +1,74 @@
+"""
+Parse stage throughput: the fixture pages parsed by CRAWL_MAX_WORKERS
+crawler threads inline (PARSE_WORKERS=0) vs. through ParseStage's process
+pool, optionally with a simulated download latency per page. The pool only
+pays off where it beats inline parsing here; PARSE_WORKERS stays 0 until
+it does on the host the scraper runs on.
+
+    python benchmarks/bench_parse_stage.py [pages] [workers] [latency_ms]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+import job_scraper
+from bench_parsing import FIXTURES_DIR, load_fixtures
+from job_scraper import CRAWL_MAX_WORKERS, ParseStage
+
+LISTING_PARSERS = {
+    "keejob": job_scraper.parse_keejob_listing,
+    "optioncarriere": job_scraper.parse_optioncarriere_listing,
+    "tunisietravail": job_scraper.parse_tunisietravail_listing
+}
+
+
+def tasks():
+    """(func, body, encoding, *args) per fixture page, as the crawler hands them over"""
+    for site, kind, _, text in load_fixtures(FIXTURES_DIR):
+        body = text.encode("utf-8")
+        if kind == "listing":
+            yield (LISTING_PARSERS[site], body, "utf-8")
+        else:
+            yield (job_scraper.parse_job_details_page, body, "utf-8", site)
+
+
+def crawl(workers, pages, latency):
+    """Seconds for CRAWL_MAX_WORKERS threads to 'download' and parse `pages` pages"""
+    work = list(tasks())
+    with ParseStage(workers) as parser:
+        # Start the pool's processes outside the timing
+        for task in work:
+            parser.parse(*task)
+
+        def handle(index):
+            if latency:
+                time.sleep(latency)
+            return parser.parse(*work[index % len(work)])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CRAWL_MAX_WORKERS) as executor:
+            list(executor.map(handle, range(pages)))
+        return time.perf_counter() - started
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 0.0) / 1000
+    print(f"{pages} pages, {CRAWL_MAX_WORKERS} crawler threads, {os.cpu_count()} CPUs, "
+          f"{latency * 1000:.0f} ms simulated latency")
+
+    inline = crawl(0, pages, latency)
+    pooled = crawl(workers, pages, latency)
+    print(f"inline    : {inline:7.2f}s  ({pages / inline:7.1f} pages/s, PARSE_WORKERS=0)")
+    print(f"processes : {pooled:7.2f}s  ({pages / pooled:7.1f} pages/s, PARSE_WORKERS={workers})")
+    print(f"speedup   : {inline / pooled:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Parse throughput per site and page type: lxml with SoupStrainer and
+precompiled selectors vs. the original full html.parser trees. Also checks
+that both paths extract the same fields from every page, and exits
+non-zero on a mismatch.
+
+By default it runs over benchmarks/fixtures/ (<site>_<listing|detail>*.html,
+one listing and one detail page per site); pass an HttpCache directory to
+use the pages a scrape saved instead. --capture copies the pages of an
+HttpCache directory into benchmarks/fixtures/ so they can be committed.
+
+    python benchmarks/bench_parsing.py [cache_dir] [rounds]
+    python benchmarks/bench_parsing.py --capture [cache_dir]
+"""
+import hashlib
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+SITES = ("keejob", "optioncarriere", "tunisietravail")
+
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+from bs4 import BeautifulSoup
+
+import job_scraper
+from job_scraper import HTTP_CACHE_DIR, SELECTORS, parse_html, parse_job_details, site_from_link
+
+
+def load_pages(directory):
+    """(site, kind, url, text) for every page in an HttpCache directory"""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(os.path.join(directory, name[:-5] + ".gz"), "rb") as f:
+                body = gzip.decompress(f.read())
+        except (OSError, ValueError, EOFError):
+            continue
+        url = meta["url"]
+        site = site_from_link(url)
+        if site not in SITES:
+            continue
+        kind = "listing" if re.search(r"keywords=|/emploi\?|/category/|/search/", url) else "detail"
+        # Decoded exactly as the scraper sees it
+        text = job_scraper._response_from_cache(url, meta, body).text
+        pages.append((site, kind, url, text))
+    return pages
+
+
+def load_fixtures(directory):
+    """(site, kind, file name, text) for every <site>_<kind>*.html fixture"""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        match = re.match(r"(\w+?)_(listing|detail)\b.*\.html$", name)
+        if not match or match.group(1) not in SITES:
+            continue
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+            pages.append((match.group(1), match.group(2), name, f.read()))
+    return pages
+
+
+def capture(directory):
+    """Save the HttpCache pages of `directory` as fixtures"""
+    pages = load_pages(directory)
+    for site, kind, url, text in pages:
+        name = f"{site}_{kind}_{hashlib.sha1(url.encode()).hexdigest()[:8]}.html"
+        with open(os.path.join(FIXTURES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"{name}  <- {url}")
+    print(f"{len(pages)} pages saved to {FIXTURES_DIR}")
+    return 0
+
+
+def legacy_parse_job_details(html, site):
+    """fetch_job_details' parsing as it was before lxml and the strainers"""
+    soup = BeautifulSoup(html, "html.parser")
+    description, publish_date, location, experience = "N/A", "N/A", "N/A", "N/A"
+
+    if site == "keejob":
+        desc_section = soup.find("div", class_="block_a", style=lambda x: x and "padding: 15px 30px 5px" in x)
+        if desc_section:
+            for meta in desc_section.find_all("div", class_="meta_a"):
+                meta.decompose()
+            description = desc_section.get_text(strip=True)
+        details_div = soup.find("div", class_="text", style="margin-bottom:20px;")
+        if details_div:
+            details = {}
+            for meta in details_div.find_all("div", class_="meta"):
+                label = meta.find("b")
+                if label:
+                    key = label.text.strip(":").strip().lower()
+                    details[key] = meta.get_text(strip=True).replace(label.text, "").strip()
+            location = details.get("lieu de travail", "N/A")
+            exp_parts = []
+            if "type de poste" in details:
+                exp_parts.append(details["type de poste"])
+            if "expérience" in details:
+                exp_parts.append(details["expérience"])
+            if "étude" in details:
+                exp_parts.append(f"Niveau: {details['étude']}")
+            if "rémunération proposée" in details:
+                exp_parts.append(f"Salaire: {details['rémunération proposée']}")
+            experience = " | ".join(exp_parts) if exp_parts else "N/A"
+            if "publiée le" in details:
+                publish_date = details["publiée le"]
+            company = details.get("entreprise", "").strip()
+            if company and company != "N/A":
+                description = f"Entreprise: {company} | {description}"
+
+    elif site == "optioncarriere":
+        header = soup.find("header")
+        if header:
+            content_section = soup.find("section", class_="content")
+            description = content_section.get_text(strip=True) if content_section else "N/A"
+            company_section = header.find("p", class_="company")
+            if company_section:
+                description = f"Company: {company_section.get_text(strip=True)} | {description}"
+            details_list = header.find("ul", class_="details")
+            if details_list:
+                contract_info = []
+                for detail in details_list.find_all("li"):
+                    if detail.find("svg", {"class": "icon"}):
+                        location_span = detail.find("span")
+                        if location_span:
+                            location = location_span.get_text(strip=True)
+                    else:
+                        contract_text = detail.get_text(strip=True)
+                        if contract_text:
+                            contract_info.append(contract_text)
+                experience = " | ".join(contract_info) if contract_info else "N/A"
+            publish_date = datetime.now().date()
+            tags = header.find("ul", class_="tags")
+            if tags:
+                date_badge = tags.find("span", class_="badge", string=lambda x: "jours" in str(x))
+                if date_badge:
+                    date_text = date_badge.get_text(strip=True)
+                    days = re.search(r"(\d+)", date_text)
+                    if "jours" in date_text and days:
+                        publish_date = datetime.now().date() - timedelta(days=int(days.group(1)))
+
+    elif site == "tunisietravail":
+        desc_section = soup.find("div", class_="PostContent")
+        if desc_section:
+            for script in desc_section.find_all(["script", "ins"]):
+                script.decompose()
+            description = desc_section.get_text(strip=True)
+            location_match = re.search(r"Ville\s*›\s*([^›\n]+)", desc_section.text)
+            location = location_match.group(1).strip() if location_match else "N/A"
+            company_match = re.search(r"Entreprise\s*›\s*([^›\n]+)", desc_section.text)
+            company = company_match.group(1).strip() if company_match else "N/A"
+            exp_match = re.search(r"expérience\s*[d\']*au moins\s*(\d+)\s*ans?", description, re.IGNORECASE)
+            experience = f"{exp_match.group(1)} ans d'expérience" if exp_match else "N/A"
+            if company != "N/A":
+                description = f"Entreprise: {company} | {description}"
+        if "CDI" in description:
+            experience = f"CDI | {experience}"
+        elif "CDD" in description:
+            experience = f"CDD | {experience}"
+        publish_date = None
+
+    return description, publish_date, location, experience
+
+
+def _posting_fields(postings, preview=None):
+    return [
+        (job.get_text(" ", strip=True),
+         [a.get("href") for a in job.find_all("a")],
+         preview(job) if preview else None)
+        for job in postings
+    ]
+
+
+def legacy_listing(html, site):
+    soup = BeautifulSoup(html, "html.parser")
+    if site == "keejob":
+        return _posting_fields(soup.find_all("div", class_="block_white_a")), None
+    if site == "optioncarriere":
+        return _posting_fields(soup.find_all("article", class_="job")), None
+    preview = lambda job: job.find("div", style=lambda x: x and "line-height:18px" in x)
+    return _posting_fields(soup.find_all("div", class_="Post"), lambda job: str(preview(job))), None
+
+
+def fast_listing(html, site):
+    soup = parse_html(html, site, "listing")
+    postings = SELECTORS[f"{site}_posting"].select(soup)
+    if site != "tunisietravail":
+        return _posting_fields(postings), None
+    preview = lambda job: SELECTORS["tunisietravail_preview"].select_one(job)
+    return _posting_fields(postings, lambda job: str(preview(job))), None
+
+
+def _timed(func, pages, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for site, _, _, text in pages:
+            func(text, site)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--capture":
+        return capture(sys.argv[2] if len(sys.argv) > 2 else HTTP_CACHE_DIR)
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIR
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if not os.path.isdir(directory):
+        print(f"No saved pages in {directory}; run a scrape first")
+        return 1
+    pages = load_fixtures(directory) if directory == FIXTURES_DIR else load_pages(directory)
+    print(f"{len(pages)} saved pages in {directory}")
+    if not pages:
+        return 1
+
+    parsers = {
+        "listing": (legacy_listing, fast_listing),
+        "detail": (legacy_parse_job_details, parse_job_details)
+    }
+    mismatches = []
+    for site, kind, url, text in pages:
+        legacy, fast = parsers[kind]
+        if legacy(text, site) != fast(text, site):
+            mismatches.append(url)
+    print(f"{len(mismatches)} extraction mismatches")
+    for url in mismatches[:10]:
+        print(f"  mismatch: {url}")
+
+    for site in SITES:
+        for kind, (legacy, fast) in parsers.items():
+            group = [page for page in pages if page[0] == site and page[1] == kind]
+            if not group:
+                continue
+            megabytes = sum(len(page[3]) for page in group) / 1e6
+            legacy_time = _timed(legacy, group, rounds)
+            fast_time = _timed(fast, group, rounds)
+            print(f"{site:15s} {kind:8s} {len(group):4d} pages  "
+                  f"legacy {len(group) / legacy_time:7.1f} pages/s  "
+                  f"fast {len(group) / fast_time:7.1f} pages/s  "
+                  f"({megabytes / fast_time:5.1f} MB/s, {legacy_time / fast_time:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Micro-benchmark: compiled KeywordMatcher scoring and score_jobs_batch
+vs. the original per-keyword `in` loops, over the postings in jobs.db.
+
+    python benchmarks/bench_scoring.py [rounds]
+"""
+import os
+import re
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import job_scraper
+from job_scraper import EXCLUDED_KEYWORDS, KEYWORDS, DB_FILE
+
+
+def legacy_job_scoring(title, description):
+    """advanced_job_scoring as it was before the compiled matcher"""
+    score = 0
+    title_lower = title.lower()
+    desc_lower = description.lower()
+
+    for excluded in EXCLUDED_KEYWORDS:
+        if excluded in title_lower:
+            if excluded == "architecte" and "logiciel" in title_lower:
+                continue
+            return 0
+
+    for category, (title_weight, desc_weight) in job_scraper.SCORING_WEIGHTS.items():
+        for keyword in KEYWORDS[category]:
+            if keyword in title_lower:
+                score += title_weight
+            if keyword in desc_lower:
+                score += desc_weight
+
+    if ("symfony" in title_lower and "php" in title_lower) or \
+       ("react" in title_lower and "javascript" in title_lower) or \
+       ("full stack" in title_lower or "fullstack" in title_lower):
+        score += 5
+
+    if "junior" in title_lower or "débutant" in title_lower:
+        score += 3
+
+    return score
+
+
+def legacy_should_exclude_job(title, description):
+    """should_exclude_job as it was before the compiled matcher"""
+    title_lower = title.lower()
+    desc_lower = description.lower()
+
+    for keyword in EXCLUDED_KEYWORDS:
+        if keyword.lower() in title_lower:
+            return True
+
+    experience_patterns = [
+        r'(\d+)[\s-]*ans? d\'expérience',
+        r'expérience .*?(\d+)[\s-]*ans?',
+        r'(\d+)[\s-]*years? experience',
+        r'experience .*?(\d+)[\s-]*years?'
+    ]
+    for pattern in experience_patterns:
+        match = re.search(pattern, desc_lower)
+        if match and int(match.group(1)) > 5:
+            return True
+    return False
+
+
+def legacy_listing_filter(title):
+    return any(kw.lower() in title.lower() for kw in KEYWORDS['core'] + KEYWORDS['job_titles'])
+
+
+def timed(func, rows, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for title, description in rows:
+            func(title, description)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _timed_batch(rows):
+    started = time.perf_counter()
+    job_scraper.score_jobs_batch(rows)
+    return time.perf_counter() - started
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    conn = sqlite3.connect(DB_FILE)
+    rows = [(title or "", description or "") for title, description in
+            conn.execute("SELECT title, description FROM jobs")]
+    conn.close()
+
+    # Silence the per-job exclusion logging while timing
+    job_scraper.logging.disable(job_scraper.logging.INFO)
+
+    mismatches = [
+        title for title, description in rows
+        if legacy_job_scoring(title, description) != job_scraper.advanced_job_scoring(title, description)
+        or legacy_should_exclude_job(title, description) != job_scraper.should_exclude_job(title, description)
+        or legacy_listing_filter(title) != job_scraper.title_matches_keywords(title)
+    ]
+    batch_scores = job_scraper.score_jobs_batch(rows).tolist()
+    mismatches += [
+        title for (title, description), score in zip(rows, batch_scores)
+        if score != legacy_job_scoring(title, description)
+    ]
+    print(f"{len(rows)} postings, {len(mismatches)} scoring mismatches")
+    for title in mismatches[:10]:
+        print(f"  mismatch: {title}")
+
+    def legacy(title, description):
+        if not legacy_should_exclude_job(title, description):
+            legacy_job_scoring(title, description)
+
+    def compiled(title, description):
+        title_hits = job_scraper.KEYWORD_MATCHER.find(title.lower())
+        if not job_scraper.should_exclude_job(title, description, title_hits):
+            job_scraper.advanced_job_scoring(title, description, title_hits)
+
+    legacy_time = timed(legacy, rows, rounds)
+    compiled_time = timed(compiled, rows, rounds)
+    per_job = 1e6 / max(len(rows), 1)
+    print(f"legacy   : {legacy_time * 1000:8.1f} ms  ({legacy_time * per_job:6.1f} us/job)")
+    print(f"compiled : {compiled_time * 1000:8.1f} ms  ({compiled_time * per_job:6.1f} us/job)")
+    print(f"speedup  : {legacy_time / compiled_time:.1f}x")
+
+    # Re-scoring the whole table in one call, as after a keyword-list change
+    batch_time = min(_timed_batch(rows) for _ in range(rounds))
+    print(f"batch    : {batch_time * 1000:8.1f} ms  ({batch_time * per_job:6.1f} us/job, score_jobs_batch)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
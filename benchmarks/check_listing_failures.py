@@ -0,0 +1,141 @@
+"""
+Regression check for failed listing pages: a request error past page 1
+must not advance a source's high-water mark, and a scrape run whose
+requests all fail must be recorded as failed, with its failed keywords.
+Listings are served by a stub make_request (no network) into a throwaway
+database; exits non-zero if a check fails.
+
+    python benchmarks/check_listing_failures.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+import requests
+
+import job_scraper
+from job_scraper import CrawlWatermarks, FetchFailed
+
+TITLE = "Ingénieur chimiste"
+TODAY = datetime.now().date()
+# Page -> posting numbers; page 3 and beyond answer 404
+PAGES = {1: [1, 2], 2: [3, 4, 5]}
+
+requested = []
+failures = {}  # page -> exception to raise
+
+
+def page_of(url):
+    match = re.search(r"(?:page/|[&?]page=)(\d+)", url)
+    return int(match.group(1)) if match else 1
+
+
+def stub_make_request(url, *args, **kwargs):
+    requested.append(url)
+    page = page_of(url)
+    if page in failures:
+        raise failures[page]
+    response = requests.Response()
+    response.url = url
+    response.encoding = "utf-8"
+    if page not in PAGES:
+        response.status_code = 404
+        raise requests.exceptions.HTTPError(f"404 for {url}", response=response)
+    response.status_code = 200
+    response._content = ",".join(map(str, PAGES[page])).encode()
+    return response
+
+
+def postings(body):
+    # Newest first, one day apart
+    return [(TITLE, f"https://example.test/t/{n}", TODAY - timedelta(days=n)) for n in map(int, body.decode().split(","))]
+
+
+def stub_tunisietravail_listing(body, encoding):
+    return [(title, link, date, "preview") for title, link, date in postings(body)]
+
+
+def stub_keejob_listing(body, encoding):
+    return [(title, link, date, "Tunis", None) for title, link, date in postings(body)]
+
+
+def links(listings):
+    return sorted(listing[1].rsplit("/", 1)[1] for listing in listings)
+
+
+def check(name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}{': ' + detail if detail and not ok else ''}")
+    return ok
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    job_scraper.DB_FILE = os.path.join(os.getcwd(), "jobs.db")
+    job_scraper.initialize_db()
+    job_scraper.make_request = stub_make_request
+    job_scraper.parse_tunisietravail_listing = stub_tunisietravail_listing
+    job_scraper.parse_keejob_listing = stub_keejob_listing
+    job_scraper.fetch_job_details = lambda url, site, parser=None: ("description", "N/A", "N/A", "N/A")
+    job_scraper.TUNISIETRAVAIL_CATEGORIES = ["chimie/"]
+    results = []
+
+    # Run 1: page 2 of the category times out after page 1 was read
+    failures[2] = requests.exceptions.Timeout("read timed out")
+    watermarks = CrawlWatermarks.load()
+    listings, failed = job_scraper.fetch_tunisietravail_listings(watermarks=watermarks)
+    watermarks.save()
+    results.append(check("page-2 timeout reports the category", failed == ["chimie/"], str(failed)))
+    results.append(check(
+        "page-2 timeout keeps the old mark",
+        CrawlWatermarks.load().mark("tunisietravail", "chimie/") is None,
+        str(CrawlWatermarks.load().mark("tunisietravail", "chimie/"))
+    ))
+
+    # Run 2: the site is back; the postings behind page 1 must be crawled
+    failures.clear()
+    requested.clear()
+    watermarks = CrawlWatermarks.load()
+    listings, failed = job_scraper.fetch_tunisietravail_listings(watermarks=watermarks)
+    watermarks.save()
+    results.append(check(
+        "next run reaches page 2", links(listings) == ["1", "2", "3", "4", "5"] and not failed,
+        f"{links(listings)} from {requested}"
+    ))
+    results.append(check(
+        "a 404 past page 1 ends the listing",
+        CrawlWatermarks.load().mark("tunisietravail", "chimie/") is not None
+    ))
+
+    # keejob: the jobs from page 1 survive a page-2 failure, the mark doesn't move
+    failures[2] = requests.exceptions.ConnectionError("connection reset")
+    watermarks = CrawlWatermarks()
+    try:
+        job_scraper.fetch_jobs_from_keejob("chimiste", set(), watermarks=watermarks)
+        results.append(check("keejob page-2 failure raises FetchFailed", False, "returned normally"))
+    except FetchFailed as e:
+        results.append(check("keejob page-2 failure raises FetchFailed", links(e.jobs) == ["1", "2"], links(e.jobs)))
+    results.append(check("keejob page-2 failure keeps the old mark", ("keejob", "chimiste") in watermarks._failed))
+
+    # A scheduled run where every request fails is a failed run, per site
+    failures.update({page: requests.exceptions.ConnectionError("connection refused") for page in (1, 2, 3)})
+    job_scraper.KEYWORDS = {category: keywords[:1] for category, keywords in job_scraper.KEYWORDS.items()}
+    run_id, _ = job_scraper.scrape_scheduler.start("check", wait=True, mode="search")
+    run = job_scraper.get_scrape_run(run_id)
+    failed_sites = {site: counters["failed"] for site, counters in run["site_counters"].items()}
+    results.append(check("all-failed run is marked failed", run["status"] == "failed", run["status"]))
+    results.append(check(
+        "every site records its failures",
+        set(failed_sites) == set(job_scraper.SITE_FETCHERS) and all(failed_sites.values()), str(failed_sites)
+    ))
+    results.append(check("failed keywords are recorded", bool(run["failed_keywords"])))
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,79 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import sqlite3
 from datetime import datetime, timedelta
 import time
 import re
 import logging
-from datetime import datetime, timedelta
-import backoff  # Add this import
+import os
+import sys
+import gzip
+import json
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing, contextmanager
+from functools import partial
+from urllib.parse import urlparse
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree import ElementTree
+import numpy as np
+from scipy import sparse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 
 DB_FILE = "jobs.db"
 
+# Crawl concurrency: keyword/site pairs fetched in parallel, and the most
+# requests any single job board sees at once
+CRAWL_MAX_WORKERS = 12
+CRAWL_PER_HOST_LIMIT = 4
+
+# One retry policy for every request: up to REQUEST_ATTEMPTS tries on
+# connection errors, timeouts and RETRY_STATUSES, paced by the host's
+# HostLimiter rather than by fixed sleeps
+REQUEST_ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Per-host token bucket (requests/second). The rate creeps up while a site
+# answers quickly, and is cut on slow answers, 429/5xx and connection
+# errors; Retry-After pauses the host. The circuit breaker opens once
+# requests (after their retries) for CIRCUIT_BREAKER_FAILURES distinct URLs
+# have failed over at least CIRCUIT_BREAKER_WINDOW seconds with no success
+# in between; the host is then skipped, except for one probe request every
+# CIRCUIT_BREAKER_COOLDOWN seconds that closes the breaker if it succeeds.
+HOST_RATE_INITIAL = 4.0
+HOST_RATE_MIN = 0.2
+HOST_RATE_MAX = 10.0
+HOST_RATE_BURST = 4
+HOST_RATE_INCREASE = 0.2
+HOST_SLOW_RESPONSE = 3.0
+HOST_FAILURE_BACKOFF = 2.0
+HOST_MAX_PAUSE = 120.0
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_WINDOW = 30.0
+CIRCUIT_BREAKER_COOLDOWN = 60.0
+
+# Downloaded pages are parsed in this many worker processes (0 parses on the
+# crawler threads). Downloads pause while PARSE_QUEUE_PER_WORKER pages per
+# worker are already waiting for a parser. Inline parsing stays the default
+# until benchmarks/bench_parse_stage.py shows the pool winning on the host.
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0"))
+PARSE_QUEUE_PER_WORKER = 2
+
+# On-disk HTTP cache. Listing pages are served locally for LISTING_CACHE_TTL
+# seconds, detail pages for DETAIL_CACHE_TTL; after that they are revalidated
+# with a conditional GET.
+HTTP_CACHE_DIR = "http_cache"
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+LISTING_CACHE_TTL = 3600
+DETAIL_CACHE_TTL = 7 * 86400
+
 # Expanded and refined keywords for chemistry jobs
 EXCLUDED_KEYWORDS = {
     # Other fields to exclude
@@ -168,88 +229,812 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1"
 }
 
-def create_session():
+class TrackedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter that keeps the request and connection counts of the pools
+    its pool manager evicts or closes, so get_connection_stats covers every
+    pool it ever used, not just the ones still in the pool manager's LRU.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._retired_lock = threading.Lock()
+        self._retired_requests = 0
+        self._retired_connections = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._retire_pool
+
+    def _retire_pool(self, pool):
+        with self._retired_lock:
+            self._retired_requests += pool.num_requests
+            self._retired_connections += pool.num_connections
+        pool.close()
+
+    def get_connection_stats(self):
+        """(requests sent, connections opened) since the adapter was created"""
+        with self._retired_lock:
+            requests_sent = self._retired_requests
+            connections_opened = self._retired_connections
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+        return requests_sent, connections_opened
+
+def create_session(pool_size=CRAWL_PER_HOST_LIMIT):
     session = requests.Session()
-    retry_strategy = requests.adapters.Retry(
-        total=5,  # Increase total retries
-        backoff_factor=2,  # Increase backoff time between retries
-        status_forcelist=[500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST"]
+    # No adapter-level retries: send_request owns the retry policy
+    adapter = TrackedHTTPAdapter(
+        pool_maxsize=pool_size  # one kept-alive connection per concurrent request
     )
-    adapter = requests.adapters.HTTPAdapter(max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
-# Add exponential backoff decorator for request functions
-@backoff.on_exception(
-    backoff.expo,
-    (requests.exceptions.RequestException, requests.exceptions.Timeout),
-    max_tries=5
-)
-def make_request(url, session=None, timeout=(30, 30)):
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(url):
+    """
+    Return the long-lived pooled session for the url's host, creating it on
+    first use. Connections are kept alive and reused across keywords, runs
+    and detail pages.
+    """
+    host = urlparse(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = create_session()
+            _sessions[host] = session
+    return session
+
+def get_connection_stats():
+    """Requests sent and TCP connections opened per host since startup"""
+    with _sessions_lock:
+        sessions = list(_sessions.items())
+
+    stats = {}
+    for host, session in sessions:
+        requests_sent = 0
+        connections_opened = 0
+        for adapter in set(session.adapters.values()):
+            if isinstance(adapter, TrackedHTTPAdapter):
+                adapter_requests, adapter_connections = adapter.get_connection_stats()
+                requests_sent += adapter_requests
+                connections_opened += adapter_connections
+        stats[host] = {
+            "requests": requests_sent,
+            "connections": connections_opened,
+            "reused": max(requests_sent - connections_opened, 0)
+        }
+    return stats
+
+def log_connection_stats():
+    for host, host_stats in get_connection_stats().items():
+        logging.info(
+            f"Connection pool {host}: {host_stats['requests']} requests over "
+            f"{host_stats['connections']} connections ({host_stats['reused']} reused)"
+        )
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+@contextmanager
+def host_slot(url):
     """
-    Make HTTP request with retries and backoff
+    Hold one of the per-host request slots while talking to the url's site
+    """
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(CRAWL_PER_HOST_LIMIT)
+            _host_semaphores[host] = semaphore
+    with semaphore:
+        yield
+
+class HostUnavailable(requests.exceptions.ConnectionError):
+    """The host's circuit breaker is open; it is skipped until a probe succeeds"""
+
+class HostLimiter:
+    """
+    Adaptive token bucket and circuit breaker for one host. Every request
+    takes a token first; outcomes feed back into the refill rate (additive
+    increase, multiplicative decrease). Every attempt's failure cuts the
+    rate, but only whole requests that failed count towards the breaker.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.rate = HOST_RATE_INITIAL
+        self._tokens = float(HOST_RATE_BURST)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._failures = 0
+        self._failed_urls = set()
+        self._failing_since = None
+        self._probe_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.circuit_open = False
+        self.counters = {
+            "requests": 0, "ok": 0, "retries": 0, "throttled": 0,
+            "errors": 0, "skipped": 0, "waited": 0.0
+        }
+
+    def acquire(self, retry=False):
+        """Block until the host may be sent another request"""
+        if retry:
+            with self._lock:
+                self.counters["retries"] += 1
+        probe = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.circuit_open and not probe:
+                    if now < self._probe_at:
+                        self.counters["skipped"] += 1
+                        raise HostUnavailable(f"{self.host} is down, skipped until a probe request succeeds")
+                    # Half-open: let this one request through as a probe
+                    probe = self._probing = True
+                    self._probe_at = now + CIRCUIT_BREAKER_COOLDOWN
+                    logging.info(f"{self.host}: sending a probe request")
+                self._tokens = min(HOST_RATE_BURST, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.counters["requests"] += 1
+                    return
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                self.counters["waited"] += delay
+            time.sleep(delay)
+
+    def record_success(self, elapsed):
+        with self._lock:
+            self.counters["ok"] += 1
+            self._failures = 0
+            self._failed_urls.clear()
+            self._failing_since = None
+            if self.circuit_open:
+                self.circuit_open = self._probing = False
+                logging.info(f"{self.host}: answering again, circuit closed")
+            if elapsed > HOST_SLOW_RESPONSE:
+                self.rate = max(HOST_RATE_MIN, self.rate * 0.8)
+            else:
+                self.rate = min(HOST_RATE_MAX, self.rate + HOST_RATE_INCREASE)
+
+    def record_throttle(self, retry_after=None):
+        """429, or 503 with Retry-After: the site is alive but wants less traffic"""
+        with self._lock:
+            self.counters["throttled"] += 1
+            if self.circuit_open:
+                # Rate limited, but answering
+                self.circuit_open = self._probing = False
+                logging.info(f"{self.host}: answering again, circuit closed")
+            self.rate = max(HOST_RATE_MIN, self.rate / 2)
+            pause = min(retry_after if retry_after is not None else 1 / self.rate, HOST_MAX_PAUSE)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def record_failure(self):
+        """One attempt ended in a connection error, timeout or 5xx"""
+        with self._lock:
+            self.counters["errors"] += 1
+            self._failures += 1
+            self.rate = max(HOST_RATE_MIN, self.rate / 2)
+            pause = min(HOST_FAILURE_BACKOFF ** self._failures, HOST_MAX_PAUSE)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            if self._probing:
+                self._probing = False
+                logging.warning(f"{self.host}: probe request failed, still skipping it")
+
+    def record_request_failure(self, url):
+        """A request failed on every attempt; may open the breaker"""
+        with self._lock:
+            now = time.monotonic()
+            self._failed_urls.add(url)
+            if self._failing_since is None:
+                self._failing_since = now
+            if not self.circuit_open and len(self._failed_urls) >= CIRCUIT_BREAKER_FAILURES \
+                    and now - self._failing_since >= CIRCUIT_BREAKER_WINDOW:
+                self.circuit_open = True
+                self._probe_at = now + CIRCUIT_BREAKER_COOLDOWN
+                logging.warning(
+                    f"{self.host}: requests for {len(self._failed_urls)} URLs failed over "
+                    f"{now - self._failing_since:.0f}s, skipping it until a probe request succeeds"
+                )
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self.counters,
+                "waited": round(self.counters["waited"], 1),
+                "rate": round(self.rate, 2),
+                "circuit_open": self.circuit_open
+            }
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+def get_host_limiter(url):
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(host)
+            _host_limiters[host] = limiter
+    return limiter
+
+def reset_host_limiters():
+    """Start a run with closed breakers and fresh counters"""
+    with _host_limiters_lock:
+        _host_limiters.clear()
+
+def get_host_limiter_stats():
+    with _host_limiters_lock:
+        limiters = list(_host_limiters.values())
+    return {limiter.host: limiter.get_stats() for limiter in limiters}
+
+def log_host_limiter_stats():
+    for host, host_stats in get_host_limiter_stats().items():
+        logging.info(
+            f"Host {host}: {host_stats['requests']} requests, {host_stats['ok']} ok, "
+            f"{host_stats['retries']} retries, {host_stats['throttled']} throttled, "
+            f"{host_stats['errors']} errors, {host_stats['skipped']} skipped, "
+            f"{host_stats['waited']}s waiting for the limiter, final rate {host_stats['rate']}/s"
+            + (", circuit open" if host_stats['circuit_open'] else "")
+        )
+
+def _retry_after(response):
+    """Seconds asked for by a Retry-After header, if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(tz=timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def send_request(url, session, headers, timeout):
+    """
+    GET under the host's limiter, retrying connection errors, timeouts and
+    RETRY_STATUSES up to REQUEST_ATTEMPTS times. The last retryable
+    response is returned as is for the caller's raise_for_status().
+    """
+    limiter = get_host_limiter(url)
+    for attempt in range(1, REQUEST_ATTEMPTS + 1):
+        limiter.acquire(retry=attempt > 1)
+        started = time.monotonic()
+        try:
+            with host_slot(url):
+                response = session.get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            limiter.record_failure()
+            if attempt == REQUEST_ATTEMPTS or limiter.circuit_open:
+                limiter.record_request_failure(url)
+                raise
+            continue
+
+        if response.status_code not in RETRY_STATUSES:
+            limiter.record_success(time.monotonic() - started)
+            return response
+
+        retry_after = _retry_after(response)
+        throttled = response.status_code == 429 or retry_after is not None
+        if throttled:
+            limiter.record_throttle(retry_after)
+        else:
+            limiter.record_failure()
+        if attempt == REQUEST_ATTEMPTS or limiter.circuit_open:
+            if not throttled:
+                limiter.record_request_failure(url)
+            return response
+        logging.info(f"{response.status_code} from {url}, retrying (attempt {attempt + 1}/{REQUEST_ATTEMPTS})")
+    return response
+
+class HttpCache:
+    """
+    On-disk cache of gzip-compressed response bodies keyed by URL, stored
+    with the ETag/Last-Modified validators needed for conditional requests.
+    The least recently used entries are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = None  # key -> [size on disk, last used]
+        self._total_bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return key, os.path.join(self.directory, f"{key}.gz"), os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        # Called with the lock held; last use is kept in the body's mtime
+        if self._entries is not None:
+            return
+        self._entries = {}
+        self._total_bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if not name.endswith(".gz"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            self._entries[name[:-3]] = [stat.st_size, stat.st_mtime]
+            self._total_bytes += stat.st_size
+
+    def get(self, url):
+        """Return (metadata, body) for a cached url, or None"""
+        key, body_path, meta_path = self._paths(url)
+        now = time.time()
+        # Both files are read under the lock put() writes them under, so a
+        # concurrent put or eviction can't pair new metadata with an old body
+        with self._lock:
+            try:
+                with open(meta_path, "rb") as f:
+                    raw_meta = f.read()
+                with open(body_path, "rb") as f:
+                    compressed = f.read()
+            except OSError:
+                return None
+            self._load_index()
+            if key in self._entries:
+                self._entries[key][1] = now
+        try:
+            meta = json.loads(raw_meta.decode("utf-8"))
+            body = gzip.decompress(compressed)
+        except (ValueError, EOFError, OSError):
+            return None
+        try:
+            os.utime(body_path, (now, now))
+        except OSError:
+            pass
+        return meta, body
+
+    def put(self, url, response):
+        key, body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "stored_at": time.time()
+        }
+        compressed = gzip.compress(response.content, compresslevel=6)
+
+        with self._lock:
+            self._load_index()
+            self._write(body_path, compressed)
+            self._write(meta_path, json.dumps(meta).encode("utf-8"))
+            previous = self._entries.get(key)
+            if previous:
+                self._total_bytes -= previous[0]
+            self._entries[key] = [len(compressed), meta["stored_at"]]
+            self._total_bytes += len(compressed)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url, meta):
+        """Restart the freshness lifetime of an entry after a 304"""
+        _, _, meta_path = self._paths(url)
+        meta["stored_at"] = time.time()
+        with self._lock:
+            self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        # Called with the lock held; trim to 90% so we don't evict on every put
+        target = self.max_bytes * 0.9
+        for key, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            for suffix in (".gz", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, key + suffix))
+                except OSError:
+                    pass
+            del self._entries[key]
+            self._total_bytes -= size
+
+    def count(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "entries": len(self._entries or {}),
+                "bytes": self._total_bytes
+            }
+
+http_cache = HttpCache()
+
+def _response_from_cache(url, meta, body):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = meta.get("encoding")
+    if meta.get("content_type"):
+        response.headers["Content-Type"] = meta["content_type"]
+    return response
+
+def cached_get(url, session, timeout, ttl):
+    """
+    GET through the on-disk cache: fresh entries are returned without
+    touching the network, stale ones are revalidated with If-None-Match /
+    If-Modified-Since and reused on a 304
+    """
+    cached = http_cache.get(url)
+    headers = dict(HEADERS)
+    if cached:
+        meta, body = cached
+        if time.time() - meta["stored_at"] < ttl:
+            http_cache.count("hits")
+            return _response_from_cache(url, meta, body)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = send_request(url, session, headers, timeout)
+
+    if cached and response.status_code == 304:
+        http_cache.count("revalidated")
+        http_cache.refresh(url, meta)
+        return _response_from_cache(url, meta, body)
+
+    response.raise_for_status()
+    http_cache.count("misses")
+    try:
+        http_cache.put(url, response)
+    except OSError as e:
+        logging.warning(f"Could not cache {url}: {e}")
+    return response
+
+def make_request(url, session=None, timeout=(30, 30), cache_ttl=LISTING_CACHE_TTL):
+    """
+    Make HTTP request with retries and backoff (see send_request)
     """
     if session is None:
-        session = create_session()
+        session = get_session(url)
     try:
-        response = session.get(url, headers=HEADERS, timeout=timeout)
-        response.raise_for_status()
-        return response
+        return cached_get(url, session, timeout, cache_ttl)
     except requests.exceptions.RequestException as e:
         logging.error(f"Request failed for {url}: {str(e)}")
         raise
-# In database initialization
-def initialize_db():
+# SQLite tuning shared by every connection. WAL lets the API read while the
+# scraper and automator write; busy_timeout makes writers wait for each other
+# instead of failing with "database is locked".
+DB_BUSY_TIMEOUT_MS = 10000
+DB_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-32000",      # 32 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}"
+]
+
+_db_local = threading.local()
+
+def open_connection(check_same_thread=True):
+    """Open a new tuned connection to DB_FILE"""
+    conn = sqlite3.connect(
+        DB_FILE,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=check_same_thread
+    )
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_connection():
+    """
+    The calling thread's shared connection, opened on first use. Don't
+    close it; use `with conn:` around writes so they commit or roll back.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = open_connection()
+        _db_local.conn = conn
+    return conn
+
+def ensure_columns(c, table, columns):
+    """Add any of the (name, type) columns missing from an existing table"""
+    existing = {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+    for name, column_type in columns:
+        if name not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+# Host fragment -> value stored in jobs.site / application_history.site_type
+SITE_HOSTS = {
+    "tunisietravail.net": "tunisietravail",
+    "keejob.com": "keejob",
+    "optioncarriere.tn": "optioncarriere",
+    "tanitjobs.com": "tanitjobs"
+}
+
+def site_from_link(link):
+    """Site name for a job link, None for hosts we don't know"""
+    host = urlparse(link or "").netloc
+    for fragment, site in SITE_HOSTS.items():
+        if fragment in host:
+            return site
+    return None
+
+# Weights for bm25() over (title, description, location)
+SEARCH_COLUMN_WEIGHTS = (10.0, 1.0, 2.0)
+
+def create_search_index(c):
+    """
+    FTS5 index over jobs(title, description, location), stored as an
+    external-content table (no second copy of the text) and kept in sync by
+    triggers. remove_diacritics folds "expérience" and "experience" together.
+    """
+    exists = c.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+    ).fetchone()
     try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        
-        # Create jobs table with application tracking
         c.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY,
-            title TEXT,
-            link TEXT UNIQUE,
-            publish_date TEXT,
-            location TEXT,
-            experience TEXT,
-            description TEXT,
-            status TEXT,
-            added_date TIMESTAMP,
-            is_new BOOLEAN,
-            is_old BOOLEAN,
-            is_clicked BOOLEAN DEFAULT 0,
-            application_attempts INTEGER DEFAULT 0,
-            last_application_date TIMESTAMP,
-            application_success BOOLEAN
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, description, location,
+            content='jobs', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
         )
         ''')
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: /jobs falls back to LIKE
+        logging.warning(f"Full-text search unavailable: {e}")
+        return
+    c.execute('''
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    ''')
+    c.execute('''
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    ''')
+    c.execute('''
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description, location ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO jobs_fts (rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    ''')
+    if not exists:
+        # First run on an existing database: index the rows already there
+        c.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        logging.info("Built full-text search index")
+
+def search_available():
+    """True when the jobs_fts index exists"""
+    return get_connection().execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+    ).fetchone() is not None
+
+def fts_query(keyword):
+    """
+    Turn free user input into a safe FTS5 MATCH expression: every word
+    becomes a quoted prefix term, all of which must match. None if the
+    input has no searchable words.
+    """
+    words = re.findall(r"\w+", keyword or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def bump_data_version(conn):
+    """
+    Mark jobs/application data as changed. Call inside the writing
+    transaction, so the API's response cache (keyed on get_data_version)
+    sees the new version exactly when the write becomes visible.
+    """
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+def get_data_version():
+    """Current change counter; shared by every process using DB_FILE"""
+    row = get_connection().execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+# In database initialization
+def initialize_db():
+    try:
+        conn = get_connection()
+        with conn:
+            c = conn.cursor()
         
-        # Create application history table
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS application_history (
-            id INTEGER PRIMARY KEY,
-            job_id INTEGER,
-            application_date TIMESTAMP,
-            success BOOLEAN,
-            site_type TEXT,
-            error_message TEXT,
-            FOREIGN KEY (job_id) REFERENCES jobs (id)
-        )
-        ''')
+            # Create jobs table with application tracking
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                title TEXT,
+                link TEXT UNIQUE,
+                publish_date TEXT,
+                location TEXT,
+                experience TEXT,
+                description TEXT,
+                status TEXT,
+                added_date TIMESTAMP,
+                is_new BOOLEAN,
+                is_old BOOLEAN,
+                is_clicked BOOLEAN DEFAULT 0,
+                application_attempts INTEGER DEFAULT 0,
+                last_application_date TIMESTAMP,
+                application_success BOOLEAN
+            )
+            ''')
         
-        conn.commit()
+            # Create application history table
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS application_history (
+                id INTEGER PRIMARY KEY,
+                job_id INTEGER,
+                application_date TIMESTAMP,
+                success BOOLEAN,
+                site_type TEXT,
+                error_message TEXT,
+                FOREIGN KEY (job_id) REFERENCES jobs (id)
+            )
+            ''')
+
+            # Stored relevance: score, matched keyword ids and the keyword-set
+            # version they were computed with (see rescore_jobs)
+            ensure_columns(c, "jobs", [
+                ("relevance_score", "INTEGER"),
+                ("matched_keywords", "TEXT"),
+                ("keyword_version", "TEXT")
+            ])
+            # /jobs sorts on COALESCE(...) so rows not yet rescored (NULL)
+            # sort last and keyset cursors never hold a NULL
+            c.execute("DROP INDEX IF EXISTS idx_jobs_relevance")
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_relevance_sort
+            ON jobs (COALESCE(relevance_score, -1) DESC, id)
+            ''')
+
+            # Stored site, so the automation and API filter on an index
+            # instead of LIKE '%host%' scans over link
+            ensure_columns(c, "jobs", [("site", "TEXT")])
+            for fragment, site in SITE_HOSTS.items():
+                c.execute(
+                    "UPDATE jobs SET site = ? WHERE site IS NULL AND link LIKE ?",
+                    (site, f"%{fragment}%")
+                )
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_application
+            ON jobs (status, application_success, is_clicked, application_attempts)
+            ''')
+            c.execute("DROP INDEX IF EXISTS idx_jobs_publish_date")
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_publish_date_sort
+            ON jobs (COALESCE(publish_date, '') DESC, id DESC)
+            ''')
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_site_status
+            ON jobs (site, status)
+            ''')
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_application_history_job
+            ON application_history (job_id, site_type)
+            ''')
+
+            create_search_index(c)
+
+            # Materialized application statistics (see record_application_attempt)
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS application_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_applications INTEGER NOT NULL DEFAULT 0,
+                successful_applications INTEGER NOT NULL DEFAULT 0,
+                failed_applications INTEGER NOT NULL DEFAULT 0,
+                total_attempts INTEGER NOT NULL DEFAULT 0
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS application_site_stats (
+                site_type TEXT NOT NULL,
+                day TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                successes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (site_type, day)
+            )
+            ''')
+            if not c.execute("SELECT 1 FROM application_totals").fetchone():
+                rebuild_application_stats(c)
+
+            # Change counter for jobs/application data (see bump_data_version)
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+            ''')
+            c.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+
+            # One row per scrape run, with live progress (see ScrapeRun)
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_runs (
+                id INTEGER PRIMARY KEY,
+                trigger TEXT,
+                status TEXT,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                heartbeat_at TIMESTAMP,
+                progress_done INTEGER DEFAULT 0,
+                progress_total INTEGER DEFAULT 0,
+                jobs_processed INTEGER DEFAULT 0,
+                jobs_added INTEGER DEFAULT 0,
+                jobs_skipped INTEGER DEFAULT 0,
+                site_counters TEXT,
+                failed_keywords TEXT,
+                cancel_requested BOOLEAN DEFAULT 0,
+                error TEXT
+            )
+            ''')
+            ensure_columns(c, "scrape_runs", [("mode", "TEXT")])
+            c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scrape_runs_status
+            ON scrape_runs (status)
+            ''')
+
+            # Run log; rows with a site/keyword hold that source's high-water mark
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS update_log (
+                last_update DATETIME
+            )
+            ''')
+            ensure_columns(c, "update_log", [
+                ("site", "TEXT"),
+                ("keyword", "TEXT"),
+                ("newest_link", "TEXT"),
+                ("newest_publish_date", "TEXT")
+            ])
+            c.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_update_log_source
+            ON update_log (site, keyword)
+            ''')
+
+            # Postings discovery fetched and rejected (see record_seen_links)
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS seen_links (
+                link TEXT PRIMARY KEY,
+                site TEXT,
+                seen_at TIMESTAMP
+            )
+            ''')
     except sqlite3.Error as e:
         logging.error(f"Database initialization error: {e}")
-    finally:
-        conn.close()
 
 def get_applied_job_links():
     """Get links of all successfully applied jobs"""
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         c = conn.cursor()
         c.execute('''
             SELECT link FROM jobs 
@@ -257,74 +1042,190 @@ def get_applied_job_links():
             AND application_success = 1
         ''')
         applied_links = set(row[0] for row in c.fetchall())
-        conn.close()
         return applied_links
     except sqlite3.Error as e:
         logging.error(f"Error fetching applied links: {e}")
         return set()
 
-def record_application_attempt(job_id: int, success: bool, site_type: str, error_message: str = None):
-    """Record an application attempt in the history"""
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        
-        # Update jobs table
-        c.execute('''
-            UPDATE jobs 
-            SET application_attempts = application_attempts + 1,
-                last_application_date = ?,
-                application_success = ?,
-                status = ?
-            WHERE id = ?
-        ''', (datetime.now(), success, 'applied' if success else 'failed', job_id))
-        
-        # Add to history
+# application_site_stats rows with this day hold the all-time totals
+ALL_TIME = ""
+
+APPLICATION_TOTALS_SQL = '''
+    SELECT 
+        COUNT(*),
+        COALESCE(SUM(CASE WHEN application_success = 1 THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN application_success = 0 THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(application_attempts), 0)
+    FROM jobs 
+    WHERE status IN ('applied', 'failed')
+'''
+
+def rebuild_application_stats(c):
+    """Recompute the materialized stats from jobs and application_history"""
+    c.execute("DELETE FROM application_totals")
+    c.execute(f'''
+        INSERT INTO application_totals (
+            id, total_applications, successful_applications, failed_applications, total_attempts
+        ) SELECT 1, * FROM ({APPLICATION_TOTALS_SQL})
+    ''')
+    c.execute("DELETE FROM application_site_stats")
+    c.execute('''
+        INSERT INTO application_site_stats (site_type, day, attempts, successes)
+        SELECT COALESCE(site_type, 'unknown'), date(application_date), COUNT(*), SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END)
+        FROM application_history
+        GROUP BY 1, 2
+    ''')
+    c.execute('''
+        INSERT INTO application_site_stats (site_type, day, attempts, successes)
+        SELECT site_type, ?, SUM(attempts), SUM(successes)
+        FROM application_site_stats
+        GROUP BY site_type
+    ''', (ALL_TIME,))
+
+def _update_application_stats(c, job_id, success, site_type, previous, day):
+    """
+    Apply one attempt to the materialized stats. `previous` is the job's
+    (status, application_success, application_attempts) before the attempt,
+    so the job-level totals move exactly as APPLICATION_TOTALS_SQL would.
+    """
+    if previous:
+        status, was_success, attempts = previous
+        counted = status in ('applied', 'failed')
         c.execute('''
-            INSERT INTO application_history 
-            (job_id, application_date, success, site_type, error_message)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (job_id, datetime.now(), success, site_type, error_message))
-        
-        conn.commit()
+            UPDATE application_totals SET
+                total_applications = total_applications + ?,
+                successful_applications = successful_applications + ?,
+                failed_applications = failed_applications + ?,
+                total_attempts = total_attempts + ?
+            WHERE id = 1
+        ''', (
+            0 if counted else 1,
+            int(bool(success)) - int(counted and was_success == 1),
+            int(not success) - int(counted and was_success == 0),
+            (attempts or 0) + 1 - (attempts or 0 if counted else 0)
+        ))
+    c.executemany('''
+        INSERT INTO application_site_stats (site_type, day, attempts, successes)
+        VALUES (?, ?, 1, ?)
+        ON CONFLICT(site_type, day) DO UPDATE SET
+            attempts = attempts + 1,
+            successes = successes + excluded.successes
+    ''', [(site_type or 'unknown', bucket, int(bool(success))) for bucket in (day, ALL_TIME)])
+
+def record_application_attempt(job_id: int, success: bool, site_type: str, error_message: str = None, clicked: bool = False):
+    """
+    Record an application attempt in the history and the materialized stats;
+    `clicked` also sets is_clicked
+    """
+    try:
+        conn = get_connection()
+        with conn:
+            c = conn.cursor()
+            # Take the write lock before reading `previous`: sqlite3 would
+            # only BEGIN at the first UPDATE, and a concurrent attempt on the
+            # same job could then be counted twice
+            c.execute("BEGIN IMMEDIATE")
+            now = datetime.now()
+            previous = c.execute(
+                "SELECT status, application_success, application_attempts FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            
+            # Update jobs table
+            c.execute('''
+                UPDATE jobs 
+                SET application_attempts = application_attempts + 1,
+                    last_application_date = ?,
+                    application_success = ?,
+                    status = ?,
+                    is_clicked = CASE WHEN ? THEN 1 ELSE is_clicked END
+                WHERE id = ?
+            ''', (now, success, 'applied' if success else 'failed', clicked, job_id))
+            
+            # Add to history
+            c.execute('''
+                INSERT INTO application_history 
+                (job_id, application_date, success, site_type, error_message)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (job_id, now, success, site_type, error_message))
+            _update_application_stats(c, job_id, success, site_type, previous, now.strftime('%Y-%m-%d'))
+            bump_data_version(conn)
     except sqlite3.Error as e:
         logging.error(f"Error recording application attempt: {e}")
-    finally:
-        conn.close()
+
+# Jobs the automation may still apply to. The index on (status,
+# application_success, is_clicked, application_attempts) serves both
+# application_success branches; a row with status 'new' can never also be a
+# successful application, so no NOT IN (...) subquery is needed.
+UNAPPLIED_JOBS_QUERY = f'''
+    SELECT id, link, title
+    FROM jobs
+    WHERE status = 'new'
+    AND (application_success IS NULL OR application_success = 0)
+    AND is_clicked = 0
+    AND application_attempts < 3
+    AND site IN ({", ".join("?" * len(SITE_HOSTS))})
+'''
+UNAPPLIED_JOBS_PARAMS = tuple(SITE_HOSTS.values())
+
+APPLIED_COUNT_QUERY = "SELECT COUNT(*) FROM jobs WHERE status = 'applied'"
+
+JOBS_BY_STATUS_QUERY = "SELECT id FROM jobs WHERE status = ?"
+
+# Hot queries and the index each one is expected to search
+EXPECTED_QUERY_PLANS = [
+    (UNAPPLIED_JOBS_QUERY, UNAPPLIED_JOBS_PARAMS, "idx_jobs_status_application"),
+    (APPLIED_COUNT_QUERY, (), "idx_jobs_status_application"),
+    (APPLICATION_TOTALS_SQL, (), "idx_jobs_status_application"),
+    (JOBS_BY_STATUS_QUERY, ("new",), "idx_jobs_status_application"),
+    ("SELECT id FROM jobs WHERE site = ? AND status = ?", ("keejob", "new"), "idx_jobs_site_status"),
+    ("SELECT site_type FROM application_history WHERE job_id = ?", (1,), "idx_application_history_job"),
+    # /jobs keyset pages (main.JOB_ORDERINGS)
+    ("SELECT id FROM jobs WHERE COALESCE(jobs.relevance_score, -1) <= ? "
+     "ORDER BY COALESCE(jobs.relevance_score, -1) DESC, jobs.id", (5,), "idx_jobs_relevance_sort"),
+    ("SELECT id FROM jobs WHERE COALESCE(jobs.publish_date, '') <= ? "
+     "ORDER BY COALESCE(jobs.publish_date, '') DESC, jobs.id DESC", ("2026-01-01",), "idx_jobs_publish_date_sort")
+]
+
+def explain_query_plan(query, params=()):
+    """EXPLAIN QUERY PLAN detail lines for a query"""
+    c = get_connection().cursor()
+    c.execute(f"EXPLAIN QUERY PLAN {query}", params)
+    return [row[3] for row in c.fetchall()]
+
+def check_query_plans():
+    """
+    Regression check for the indexes above: returns the queries whose plan
+    no longer searches the expected index (e.g. after a schema or query edit).
+    """
+    failures = []
+    for query, params, index in EXPECTED_QUERY_PLANS:
+        plan = explain_query_plan(query, params)
+        # SEARCH, not SCAN: the index must narrow the rows, not just be walked
+        if not any(detail.startswith("SEARCH") and index in detail for detail in plan):
+            failures.append((" ".join(query.split()), plan))
+            logging.warning(f"Query plan regression, expected {index}: {plan}")
+    return failures
 
 def get_application_stats():
-    """Get detailed application statistics"""
+    """Get detailed application statistics (from the materialized tables)"""
     try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
+        c = get_connection().cursor()
         
         # Get overall stats
         c.execute('''
-            SELECT 
-                COUNT(*) as total_applications,
-                SUM(CASE WHEN application_success = 1 THEN 1 ELSE 0 END) as successful_applications,
-                SUM(CASE WHEN application_success = 0 THEN 1 ELSE 0 END) as failed_applications,
-                SUM(application_attempts) as total_attempts
-            FROM jobs 
-            WHERE status IN ('applied', 'failed')
+            SELECT total_applications, successful_applications, failed_applications, total_attempts
+            FROM application_totals WHERE id = 1
         ''')
-        
-        stats = c.fetchone()
+        stats = c.fetchone() or (0, 0, 0, 0)
         
         # Get stats by site
-        c.execute('''
-            SELECT 
-                site_type,
-                COUNT(*) as attempts,
-                SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successes
-            FROM application_history
-            GROUP BY site_type
-        ''')
-        
+        c.execute(
+            "SELECT site_type, attempts, successes FROM application_site_stats WHERE day = ?",
+            (ALL_TIME,)
+        )
         site_stats = c.fetchall()
         
-        conn.close()
-        
         return {
             'overall': {
                 'total_applications': stats[0],
@@ -341,91 +1242,296 @@ def get_application_stats():
         logging.error(f"Error getting application stats: {e}")
         return None
 
-def advanced_job_scoring(title, description):
+def get_daily_application_stats(days=30):
+    """Per-day attempts, successes and success rate, overall and per site, oldest first"""
+    try:
+        since = (datetime.now().date() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        c = get_connection().cursor()
+        c.execute('''
+            SELECT day, site_type, attempts, successes FROM application_site_stats
+            WHERE day >= ? AND day != ?
+            ORDER BY day
+        ''', (since, ALL_TIME))
+        trend = {}
+        for day, site_type, attempts, successes in c.fetchall():
+            bucket = trend.setdefault(day, {'day': day, 'attempts': 0, 'successes': 0, 'by_site': {}})
+            bucket['attempts'] += attempts
+            bucket['successes'] += successes
+            bucket['by_site'][site_type] = {
+                'attempts': attempts,
+                'successes': successes,
+                'success_rate': round(successes / attempts, 3) if attempts else None
+            }
+        for bucket in trend.values():
+            bucket['success_rate'] = round(bucket['successes'] / bucket['attempts'], 3) if bucket['attempts'] else None
+        return list(trend.values())
+    except sqlite3.Error as e:
+        logging.error(f"Error getting daily application stats: {e}")
+        return None
+
+# Title/description points per keyword category
+SCORING_WEIGHTS = {
+    'core': (5, 3),
+    'specializations': (4, 2),
+    'job_titles': (6, 3),
+    'domains': (3, 1)
+}
+
+BONUS_TERMS = {"symfony", "php", "react", "javascript", "full stack", "fullstack", "junior", "débutant"}
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)[\s-]*ans? d\'expérience'),
+    re.compile(r'expérience .*?(\d+)[\s-]*ans?'),
+    re.compile(r'(\d+)[\s-]*years? experience'),
+    re.compile(r'experience .*?(\d+)[\s-]*years?')
+]
+
+def _trie_pattern(terms):
+    """Regex source for a set of literal terms, shaped like a prefix trie"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A term ending here may also continue into a longer one
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Every keyword group compiled into a single trie-shaped regex, so a
+    lowercased text is scanned once instead of once per keyword. Hits are
+    plain substring matches, exactly like `keyword in text`, including
+    keywords that overlap or contain one another.
+    """
+
+    def __init__(self, groups):
+        self.groups = {name: {term.lower() for term in terms} for name, terms in groups.items()}
+        vocabulary = sorted(set().union(*self.groups.values()))
+        self._pattern = re.compile(_trie_pattern(vocabulary))
+        # The regex reports the longest term starting at a position; every
+        # shorter term starting there is one of its prefixes
+        self._prefixes = {
+            term: [other for other in vocabulary if term.startswith(other)]
+            for term in vocabulary
+        }
+
+    def find(self, text_lower):
+        """Set of (lowercased) terms occurring anywhere in text_lower"""
+        hits = set()
+        search = self._pattern.search
+        position = 0
+        while True:
+            match = search(text_lower, position)
+            if not match:
+                return hits
+            hits.update(self._prefixes[match.group()])
+            # Restart right after the match start so overlapping terms are found
+            position = match.start() + 1
+
+    def find_by_group(self, text_lower):
+        hits = self.find(text_lower)
+        return {name: hits & terms for name, terms in self.groups.items()}
+
+def _keyword_weights():
+    title_weights, desc_weights = {}, {}
+    for category, (title_weight, desc_weight) in SCORING_WEIGHTS.items():
+        for keyword in KEYWORDS[category]:
+            # Keywords are compared as written against lowercased text, so
+            # ones containing capitals (HPLC, R&D, ...) never score.
+            # Duplicates across and within lists score once per occurrence.
+            if keyword != keyword.lower():
+                continue
+            title_weights[keyword] = title_weights.get(keyword, 0) + title_weight
+            desc_weights[keyword] = desc_weights.get(keyword, 0) + desc_weight
+    return title_weights, desc_weights
+
+KEYWORD_MATCHER = KeywordMatcher({
+    **KEYWORDS,
+    'excluded': EXCLUDED_KEYWORDS,
+    'bonus': BONUS_TERMS
+})
+TITLE_WEIGHTS, DESCRIPTION_WEIGHTS = _keyword_weights()
+LISTING_TERMS = KEYWORD_MATCHER.groups['core'] | KEYWORD_MATCHER.groups['job_titles']
+
+# Sparse keyword x category occurrence matrix behind the batch scorer.
+# Keyword ids are positions in SCORING_VOCABULARY.
+SCORING_VOCABULARY = sorted(TITLE_WEIGHTS)
+SCORING_KEYWORD_IDS = {keyword: index for index, keyword in enumerate(SCORING_VOCABULARY)}
+SCORING_CATEGORIES = list(SCORING_WEIGHTS)
+
+def _category_matrix():
+    counts = {}
+    for column, category in enumerate(SCORING_CATEGORIES):
+        for keyword in KEYWORDS[category]:
+            if keyword in SCORING_KEYWORD_IDS:
+                key = (SCORING_KEYWORD_IDS[keyword], column)
+                counts[key] = counts.get(key, 0) + 1
+    rows, columns = zip(*counts) if counts else ((), ())
+    return sparse.csr_matrix(
+        (list(counts.values()), (rows, columns)),
+        shape=(len(SCORING_VOCABULARY), len(SCORING_CATEGORIES)),
+        dtype=np.int64
+    )
+
+KEYWORD_CATEGORY_MATRIX = _category_matrix()
+TITLE_CATEGORY_WEIGHTS = np.array([SCORING_WEIGHTS[c][0] for c in SCORING_CATEGORIES], dtype=np.int64)
+DESCRIPTION_CATEGORY_WEIGHTS = np.array([SCORING_WEIGHTS[c][1] for c in SCORING_CATEGORIES], dtype=np.int64)
+
+def _keyword_set_version():
+    payload = json.dumps({
+        "keywords": KEYWORDS,
+        "excluded": sorted(EXCLUDED_KEYWORDS),
+        "bonus": sorted(BONUS_TERMS),
+        "weights": SCORING_WEIGHTS
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+# Changes whenever the keyword lists or weights do; rows stored with another
+# version have stale scores and matched keyword ids
+KEYWORD_SET_VERSION = _keyword_set_version()
+
+def keyword_hit_matrix(hit_sets):
+    """Binary sparse job x keyword matrix from per-text hit sets"""
+    indptr = [0]
+    indices = []
+    for hits in hit_sets:
+        indices.extend(SCORING_KEYWORD_IDS[keyword] for keyword in hits if keyword in SCORING_KEYWORD_IDS)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int64), indices, indptr),
+        shape=(len(hit_sets), len(SCORING_VOCABULARY))
+    )
+
+def score_jobs_batch(pairs, return_matches=False, title_hits=None):
+    """
+    Score N (title, description) pairs at once. Returns an int array with
+    the same values advanced_job_scoring gives for each pair, plus the
+    matched SCORING_VOCABULARY ids per pair when return_matches is set.
+    title_hits reuses KEYWORD_MATCHER.find() results already computed for
+    the lowercased titles.
+    """
+    pairs = list(pairs)
+    title_hit_sets = []
+    desc_hits = []
+    bonus = np.zeros(len(pairs), dtype=np.int64)
+    excluded = np.zeros(len(pairs), dtype=bool)
+
+    for row, (title, description) in enumerate(pairs):
+        title_lower = (title or "").lower()
+        hits = title_hits[row] if title_hits is not None else KEYWORD_MATCHER.find(title_lower)
+        title_hit_sets.append(hits)
+
+        excluded_hits = hits & KEYWORD_MATCHER.groups['excluded']
+        if "logiciel" in title_lower:
+            excluded_hits.discard("architecte")
+        if excluded_hits:
+            # Score is 0 regardless, so don't scan the description
+            excluded[row] = True
+            desc_hits.append(set())
+            continue
+        desc_hits.append(KEYWORD_MATCHER.find((description or "").lower()))
+
+        if ("symfony" in hits and "php" in hits) or \
+           ("react" in hits and "javascript" in hits) or \
+           ("full stack" in hits or "fullstack" in hits):
+            bonus[row] += 5
+        if "junior" in hits or "débutant" in hits:
+            bonus[row] += 3
+
+    # (jobs x keywords) @ (keywords x categories) = per-job category hit
+    # counts, then weighted by the per-category points
+    title_matrix = keyword_hit_matrix(title_hit_sets)
+    desc_matrix = keyword_hit_matrix(desc_hits)
+    title_counts = title_matrix @ KEYWORD_CATEGORY_MATRIX
+    desc_counts = desc_matrix @ KEYWORD_CATEGORY_MATRIX
+    scores = title_counts @ TITLE_CATEGORY_WEIGHTS + desc_counts @ DESCRIPTION_CATEGORY_WEIGHTS + bonus
+    scores[excluded] = 0
+    scores = np.asarray(scores, dtype=np.int64)
+    if not return_matches:
+        return scores
+
+    matched = (title_matrix + desc_matrix).tocsr()
+    matched.sort_indices()
+    matches = [
+        matched.indices[matched.indptr[row]:matched.indptr[row + 1]].tolist()
+        for row in range(len(pairs))
+    ]
+    return scores, matches
+
+def title_matches_keywords(title):
+    """Listing filter: does the title contain a core keyword or job title?"""
+    return bool(KEYWORD_MATCHER.find(title.lower()) & LISTING_TERMS)
+
+def title_has_excluded_term(title):
+    """Listing filter: does the title contain an excluded term (see should_exclude_job)?"""
+    return bool(KEYWORD_MATCHER.find(title.lower()) & KEYWORD_MATCHER.groups['excluded'])
+
+def advanced_job_scoring(title, description, title_hits=None):
     """
     Enhanced scoring system for job relevance
     """
-    score = 0
     title_lower = title.lower()
-    desc_lower = description.lower()
-    
+    if title_hits is None:
+        title_hits = KEYWORD_MATCHER.find(title_lower)
+
     # Check for excluded keywords first
-    for excluded in EXCLUDED_KEYWORDS:
-        if excluded in title_lower:
-            # Special case for software architect
-            if excluded == "architecte" and "logiciel" in title_lower:
-                continue
-            return 0
-
-    # Score based on core keywords (highest weight)
-    for keyword in KEYWORDS['core']:
-        if keyword in title_lower:
-            score += 5
-        if keyword in desc_lower:
-            score += 3
-
-    # Score based on your specific technologies
-    for keyword in KEYWORDS['specializations']:
-        if keyword in title_lower:
-            score += 4
-        if keyword in desc_lower:
-            score += 2
-
-    # Score based on exact job titles
-    for keyword in KEYWORDS['job_titles']:
-        if keyword in title_lower:
-            score += 6
-        if keyword in desc_lower:
-            score += 3
-
-    # Score based on relevant domains
-    for keyword in KEYWORDS['domains']:
-        if keyword in title_lower:
-            score += 3
-        if keyword in desc_lower:
-            score += 1
+    excluded = title_hits & KEYWORD_MATCHER.groups['excluded']
+    # Special case for software architect
+    if "logiciel" in title_lower:
+        excluded.discard("architecte")
+    if excluded:
+        return 0
+
+    desc_hits = KEYWORD_MATCHER.find(description.lower())
+    score = sum(TITLE_WEIGHTS.get(keyword, 0) for keyword in title_hits)
+    score += sum(DESCRIPTION_WEIGHTS.get(keyword, 0) for keyword in desc_hits)
 
     # Bonus points for key combinations
-    if ("symfony" in title_lower and "php" in title_lower) or \
-       ("react" in title_lower and "javascript" in title_lower) or \
-       ("full stack" in title_lower or "fullstack" in title_lower):
+    if ("symfony" in title_hits and "php" in title_hits) or \
+       ("react" in title_hits and "javascript" in title_hits) or \
+       ("full stack" in title_hits or "fullstack" in title_hits):
         score += 5
 
     # Bonus for junior positions
-    if "junior" in title_lower or "débutant" in title_lower:
+    if "junior" in title_hits or "débutant" in title_hits:
         score += 3
 
     return score
 
-def should_exclude_job(title, description):
+def should_exclude_job(title, description, title_hits=None):
     """
     Check if a job should be excluded based on title and description
     """
-    title_lower = title.lower()
+    if title_hits is None:
+        title_hits = KEYWORD_MATCHER.find(title.lower())
     desc_lower = description.lower()
-    
+
     # Check for excluded keywords
-    for keyword in EXCLUDED_KEYWORDS:
-        if keyword.lower() in title_lower:
-            logging.info(f"Excluding job due to keyword '{keyword}' in title: {title}")
-            return True
-    
+    excluded = title_hits & KEYWORD_MATCHER.groups['excluded']
+    if excluded:
+        logging.info(f"Excluding job due to keyword '{min(excluded)}' in title: {title}")
+        return True
+
     # Check for experience requirements in description
-    experience_patterns = [
-        r'(\d+)[\s-]*ans? d\'expérience',
-        r'expérience .*?(\d+)[\s-]*ans?',
-        r'(\d+)[\s-]*years? experience',
-        r'experience .*?(\d+)[\s-]*years?'
-    ]
-    
-    for pattern in experience_patterns:
-        match = re.search(pattern, desc_lower)
+    for pattern in EXPERIENCE_PATTERNS:
+        match = pattern.search(desc_lower)
         if match:
             years = int(match.group(1))
             if years > 5:  # Exclude jobs requiring more than 5 years experience
                 logging.info(f"Excluding job due to high experience requirement ({years} years): {title}")
                 return True
-    
+
     return False
 
 
@@ -433,21 +1539,24 @@ def filter_jobs(jobs):
     """
     Filter jobs using the enhanced scoring system
     """
-    scored_jobs = []
-    
+    # Each title is matched once; exclusion and scoring share the hits
+    candidates = []
     for job in jobs:
-        title, link, publish_date, location, experience, description = job
-        
-        # Skip jobs with excluded terms in title
-        if should_exclude_job(title, description):
-            continue
-            
-        score = advanced_job_scoring(title, description)
-        
+        hits = KEYWORD_MATCHER.find(job[0].lower())
+        # Skip jobs with excluded terms in title or too much experience required
+        if not should_exclude_job(job[0], job[5], title_hits=hits):
+            candidates.append((job, hits))
+    scores = score_jobs_batch(
+        ((job[0], job[5]) for job, _ in candidates),
+        title_hits=[hits for _, hits in candidates]
+    )
+
+    scored_jobs = []
+    for (job, _), score in zip(candidates, scores.tolist()):
         # Only include jobs with a minimum relevance score
         if score > 8:  # Adjust threshold as needed
             scored_jobs.append((job, score))
-            logging.info(f"Matched Job - Title: {title}, Score: {score}")
+            logging.info(f"Matched Job - Title: {job[0]}, Score: {score}")
 
     # Sort by score in descending order
     scored_jobs.sort(key=lambda x: x[1], reverse=True)
@@ -518,21 +1627,141 @@ def parse_relative_date(date_str):
         logging.warning(f"Date parsing failed for {date_str}: {e}")
         return now.date()
 
-def fetch_job_details(url, site):
+# Pages are parsed by lxml, and only the blocks each page type reads are
+# built into the tree
+HTML_PARSER = "lxml"
+def class_token(*names):
+    """
+    Strainer value for elements having any of names among their classes.
+    A plain string only matches an element whose class attribute is exactly
+    that name while the tree is being built (<article class="job clicky">
+    would be dropped).
+    """
+    return re.compile(r"(?:^|\s)(?:%s)(?:\s|$)" % "|".join(map(re.escape, names)))
+
+PAGE_STRAINERS = {
+    ("keejob", "listing"): SoupStrainer("div", class_=class_token("block_white_a")),
+    ("keejob", "detail"): SoupStrainer("div", class_=class_token("block_a", "text")),
+    ("optioncarriere", "listing"): SoupStrainer("article", class_=class_token("job")),
+    ("optioncarriere", "detail"): SoupStrainer(["header", "section"]),
+    ("tunisietravail", "listing"): SoupStrainer("div", class_=class_token("Post")),
+    ("tunisietravail", "detail"): SoupStrainer("div", class_=class_token("PostContent"))
+}
+
+SELECTORS = {name: soupsieve.compile(css) for name, css in {
+    "keejob_posting": "div.block_white_a",
+    "keejob_description": 'div.block_a[style*="padding: 15px 30px 5px"]',
+    "keejob_details": 'div.text[style="margin-bottom:20px;"]',
+    "keejob_meta": "div.meta",
+    "optioncarriere_posting": "article.job",
+    "optioncarriere_content": "section.content",
+    "tunisietravail_posting": "div.Post",
+    "tunisietravail_preview": 'div[style*="line-height:18px"]',
+    "tunisietravail_content": "div.PostContent"
+}.items()}
+
+def parse_html(html, site, page):
+    """Tree of `html` holding just the blocks PAGE_STRAINERS keeps for this page type"""
+    return BeautifulSoup(html, HTML_PARSER, parse_only=PAGE_STRAINERS.get((site, page)))
+
+def decode_html(body, encoding):
+    """Response bytes decoded the way requests decodes response.text"""
+    if encoding is None:
+        # No declared charset: BeautifulSoup detects it from the markup
+        return body
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        return str(body, encoding, errors="replace")
+    except LookupError:
+        return str(body, errors="replace")
+
+_parse_pools = {}
+_parse_pools_lock = threading.Lock()
+
+def get_parse_pool(workers):
+    """
+    The process's parse pool of `workers` processes, created on first use
+    and kept for later runs. Workers come from a forkserver (spawn where
+    there is none), never forked from this multi-threaded process.
+    """
+    with _parse_pools_lock:
+        pool = _parse_pools.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            _parse_pools[workers] = pool
+        return pool
+
+def _discard_parse_pool(workers, pool):
+    """Drop a broken pool so the next run starts a fresh one"""
+    with _parse_pools_lock:
+        if _parse_pools.get(workers) is pool:
+            del _parse_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+class ParseStage:
+    """
+    CPU-bound HTML parsing in a pool of worker processes, so the crawler's
+    network threads only download and never queue up on the GIL. Pages
+    travel to the workers as raw bytes; a thread handing one over blocks
+    while the parse queue is full. With workers=0 pages are parsed inline.
+    The pool outlives the stage (see get_parse_pool). Use as a context manager.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, queue_per_worker=PARSE_QUEUE_PER_WORKER):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(workers, 1) * queue_per_worker)
+        self._pool = None
+        self._lock = threading.Lock()
+        self.parsed = 0
+
+    def __enter__(self):
+        if self.workers:
+            self._pool = get_parse_pool(self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._pool = None
+
+    def parse(self, func, body, encoding, *args):
+        """func(body, encoding, *args) on a worker process; its result must pickle"""
+        with self._lock:
+            self.parsed += 1
+        pool = self._pool
+        if pool is None:
+            return func(body, encoding, *args)
+        with self._slots:
+            try:
+                return pool.submit(func, body, encoding, *args).result()
+            except BrokenProcessPool:
+                _discard_parse_pool(self.workers, pool)
+                raise
+
+def parse_response(response, func, *args, parser=None):
+    """Run a parse_* function over a response's bytes, on `parser` when given"""
+    if parser is None:
+        return func(response.content, response.encoding, *args)
+    return parser.parse(func, response.content, response.encoding, *args)
+
+def fetch_job_details(url, site, parser=None):
+    try:
+        response = cached_get(url, get_session(url), timeout=10, ttl=DETAIL_CACHE_TTL)
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to fetch job details from {url}: {e}")
         return "N/A", "N/A", "N/A", "N/A"
+    return parse_response(response, parse_job_details_page, site, parser=parser)
 
+def parse_job_details_page(body, encoding, site):
+    return parse_job_details(decode_html(body, encoding), site)
+
+def parse_job_details(html, site):
+    """(description, publish_date, location, experience) from a detail page"""
+    soup = parse_html(html, site, "detail")
     description, publish_date, location, experience = "N/A", "N/A", "N/A", "N/A"
 
     try:
         if site == "keejob":
             # Get description from the main content area
-            desc_section = soup.find("div", class_="block_a", style=lambda x: x and "padding: 15px 30px 5px" in x)
+            desc_section = SELECTORS["keejob_description"].select_one(soup)
             if desc_section:
                 # Remove social buttons and meta sections
                 for meta in desc_section.find_all("div", class_="meta_a"):
@@ -540,9 +1769,9 @@ def fetch_job_details(url, site):
                 description = desc_section.get_text(strip=True)
 
             # Get metadata from details section
-            details_div = soup.find("div", class_="text", style="margin-bottom:20px;")
+            details_div = SELECTORS["keejob_details"].select_one(soup)
             if details_div:
-                meta_sections = details_div.find_all("div", class_="meta")
+                meta_sections = SELECTORS["keejob_meta"].select(details_div)
                 details = {}
                 for meta in meta_sections:
                     label = meta.find("b")
@@ -583,7 +1812,7 @@ def fetch_job_details(url, site):
             header = soup.find("header")
             if header:
                 # Get description
-                content_section = soup.find("section", class_="content")
+                content_section = SELECTORS["optioncarriere_content"].select_one(soup)
                 if content_section:
                     description = content_section.get_text(strip=True)
                 else:
@@ -638,7 +1867,7 @@ def fetch_job_details(url, site):
     elif site == "tunisietravail":
         try:
             # Get description from PostContent
-            desc_section = soup.find("div", class_="PostContent")
+            desc_section = SELECTORS["tunisietravail_content"].select_one(soup)
             if desc_section:
                 # Remove script tags and ads
                 for script in desc_section.find_all(["script", "ins"]):
@@ -648,7 +1877,7 @@ def fetch_job_details(url, site):
                 description = "N/A"
 
             # Get location and company info
-            info_section = soup.find("div", class_="PostContent")
+            info_section = SELECTORS["tunisietravail_content"].select_one(soup)
             if info_section:
                 # Extract location
                 location_match = re.search(r"Ville\s*›\s*([^›\n]+)", info_section.text)
@@ -684,310 +1913,830 @@ def fetch_job_details(url, site):
     return description, publish_date, location, experience
 
 
+class SeenLinkRegistry:
+    """
+    Run-scoped registry of the detail pages fetched so far, shared by all
+    fetchers. A link requested while another keyword is still fetching it
+    waits for that result, so each page is downloaded and parsed once.
+    """
+
+    def __init__(self, parser=None):
+        self._lock = threading.Lock()
+        self._details = {}
+        self.parser = parser
+        self.hits = 0
+        self.misses = 0
+
+    def fetch_details(self, url, site):
+        with self._lock:
+            future = self._details.get(url)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._details[url] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if is_owner:
+            try:
+                future.set_result(fetch_job_details(url, site, self.parser))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def get_stats(self):
+        with self._lock:
+            return {"links": len(self._details), "hits": self.hits, "misses": self.misses}
+
+
+def _date_key(publish_date):
+    """Normalize a publish date to YYYY-MM-DD, or None if it isn't one"""
+    if hasattr(publish_date, "strftime"):
+        return publish_date.strftime("%Y-%m-%d")
+    if isinstance(publish_date, str) and re.fullmatch(r"\d{4}-\d{2}-\d{2}", publish_date):
+        return publish_date
+    return None
+
+class CrawlWatermarks:
+    """
+    Per (site, keyword) high-water marks for incremental crawls: the newest
+    listing link and publish date processed by the previous run. Keyword
+    searches come back in relevance order, so a listing is only cut off at
+    a page that is entirely at or below the mark. A source with a failed
+    posting keeps its old mark, so the posting is retried next run.
+    """
+
+    def __init__(self, marks=None):
+        self._lock = threading.Lock()
+        self._marks = marks or {}
+        self._observed = {}
+        self._failed = set()
+        self.stops = 0
+
+    @classmethod
+    def load(cls):
+        marks = {}
+        try:
+            c = get_connection().cursor()
+            c.execute('''
+                SELECT site, keyword, newest_link, newest_publish_date
+                FROM update_log
+                WHERE site IS NOT NULL
+            ''')
+            for site, keyword, newest_link, newest_publish_date in c.fetchall():
+                marks[(site, keyword)] = (newest_link, newest_publish_date)
+        except sqlite3.Error as e:
+            logging.error(f"Error loading crawl watermarks: {e}")
+        return cls(marks)
+
+    def reached(self, site, keyword, link, publish_date=None):
+        """True if a listing is at or below the previous run's mark"""
+        mark = self._marks.get((site, keyword))
+        if not mark:
+            return False
+        newest_link, newest_publish_date = mark
+        publish_key = _date_key(publish_date)
+        return link == newest_link or (
+            newest_publish_date is not None and publish_key is not None
+            and publish_key < newest_publish_date
+        )
+
+    def page_reached(self, site, keyword, postings):
+        """
+        True, and counted as a stop, when every posting on a listing page
+        (tuples starting with title, link, publish_date) is at or below the mark
+        """
+        if not postings or not all(self.reached(site, keyword, posting[1], posting[2]) for posting in postings):
+            return False
+        self.count_stop()
+        return True
+
+    def count_stop(self):
+        with self._lock:
+            self.stops += 1
+
+    def mark(self, site, keyword):
+        """(newest_link, newest_publish_date) of the previous run, or None"""
+        return self._marks.get((site, keyword))
+
+    def observe(self, site, keyword, link, publish_date=None):
+        """
+        Record a listing that was processed successfully; the newest publish
+        date seen (the first listing on ties) becomes the next mark
+        """
+        publish_key = _date_key(publish_date)
+        with self._lock:
+            current = self._observed.get((site, keyword))
+            if current is None or (publish_key is not None and (current[1] is None or publish_key > current[1])):
+                self._observed[(site, keyword)] = (link, publish_key)
+
+    def fail(self, site, keyword):
+        """A listing of this source could not be processed: keep its old mark"""
+        with self._lock:
+            self._failed.add((site, keyword))
+
+    def save(self):
+        with self._lock:
+            observed = {key: mark for key, mark in self._observed.items() if key not in self._failed}
+        if not observed:
+            return
+        try:
+            conn = get_connection()
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with conn:
+                conn.executemany('''
+                    INSERT INTO update_log (last_update, site, keyword, newest_link, newest_publish_date)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (site, keyword) DO UPDATE SET
+                        last_update = excluded.last_update,
+                        newest_link = excluded.newest_link,
+                        newest_publish_date = excluded.newest_publish_date
+                ''', [
+                    (now, site, keyword, link, publish_date)
+                    for (site, keyword), (link, publish_date) in observed.items()
+                ])
+        except sqlite3.Error as e:
+            logging.error(f"Error saving crawl watermarks: {e}")
+
+
 def get_existing_job_links():
     """Get all existing job links from the database"""
     try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
+        c = get_connection().cursor()
         c.execute('SELECT link FROM jobs')
         existing_links = set(row[0] for row in c.fetchall())
-        conn.close()
         return existing_links
     except sqlite3.Error as e:
         logging.error(f"Error fetching existing links: {e}")
         return set()
 
 
-def fetch_jobs_from_optioncarriere(keyword, existing_links):
+def parse_optioncarriere_listing(body, encoding):
+    """
+    Postings on an optioncarriere search page as (title, link, publish_date,
+    date_text, company, location, preview, contract, error) tuples. `error`
+    is set when the secondary fields could not be read; like before, that
+    only matters once the posting turns out to be new.
+    """
+    soup = parse_html(decode_html(body, encoding), "optioncarriere", "listing")
+    postings = []
+
+    for job in SELECTORS["optioncarriere_posting"].select(soup):
+        try:
+            # Extract job title and link
+            title_element = job.find("h2").find("a")
+            if not title_element:
+                continue
+
+            title = title_element.get_text(strip=True)
+            link = f"https://www.optioncarriere.tn{title_element['href']}"
+
+            date_element = job.find("footer").find("span", class_="badge")
+            date_text = date_element.get_text(strip=True) if date_element else ""
+            publish_date = parse_relative_date(date_text) if date_text else datetime.now().date()
+        except Exception as e:
+            logging.error(f"Error parsing job from optioncarriere: {str(e)}")
+            continue
+
+        company = location = preview = contract = error = None
+        try:
+            company_element = job.find("p", class_="company")
+            company = company_element.get_text(strip=True) if company_element else "N/A"
+
+            location_element = job.find("ul", class_="location").find("li")
+            location = location_element.get_text(strip=True) if location_element else "N/A"
+
+            desc_element = job.find("div", class_="desc")
+            preview = desc_element.get_text(strip=True) if desc_element else None
+
+            contract_type = job.find("li", string=lambda text: text and ("CDI" in text or "CDD" in text))
+            contract = contract_type.get_text(strip=True) if contract_type else None
+        except Exception as e:
+            error = str(e)
+
+        postings.append((title, link, publish_date, date_text, company, location, preview, contract, error))
+
+    return postings
+
+class FetchFailed(Exception):
+    """
+    A keyword/site fetch could not read its whole listing. `jobs` holds the
+    postings it did get; update_jobs keeps them and counts the task failed.
+    """
+
+    def __init__(self, message, jobs=()):
+        super().__init__(message)
+        self.jobs = list(jobs)
+
+def fetch_jobs_from_optioncarriere(keyword, existing_links, registry=None, watermarks=None, parser=None):
     """Enhanced optioncarriere job fetching with duplicate prevention"""
+    fetch_details = registry.fetch_details if registry else partial(fetch_job_details, parser=parser)
+    watermarks = watermarks if watermarks is not None else CrawlWatermarks()
     url = BASE_URLS["optioncarriere"].format(query=keyword)
     logging.info(f"Fetching jobs from optioncarriere for keyword: {keyword}")
-    
-    try:
-        session = create_session()
-        response = make_request(url, session)
-        soup = BeautifulSoup(response.text, "html.parser")
-        jobs = []
+    jobs = []
 
-        job_listings = soup.find_all("article", class_="job")
+    try:
         new_listings = 0
         skipped_listings = 0
-        
-        for job in job_listings:
-            try:
-                # Extract job title and link
-                title_element = job.find("h2").find("a")
-                if not title_element:
-                    continue
-                
-                title = title_element.get_text(strip=True)
-                link = f"https://www.optioncarriere.tn{title_element['href']}"
-
-                # Skip if job already exists in database
-                if link in existing_links:
-                    skipped_listings += 1
-                    logging.debug(f"Skipping existing job: {title}")
-                    continue
-
-                # Skip if job doesn't match criteria
-                if should_exclude_job(title, ""):
-                    logging.info(f"Skipping excluded job: {title}")
-                    continue
-
-                company_element = job.find("p", class_="company")
-                company = company_element.get_text(strip=True) if company_element else "N/A"
-
-                location_element = job.find("ul", class_="location").find("li")
-                location = location_element.get_text(strip=True) if location_element else "N/A"
-
-                date_element = job.find("footer").find("span", class_="badge")
-                if date_element:
-                    date_text = date_element.get_text(strip=True)
-                    if "jours" in date_text:
-                        days = int(re.search(r"(\d+)", date_text).group(1))
-                        if days > 15:
+
+        # Results are ranked by relevance: only a page entirely at or below
+        # last run's mark, or with excluded titles, ends the listing
+        crawled = lambda posting: (
+            title_has_excluded_term(posting[0])
+            or watermarks.reached("optioncarriere", keyword, posting[1], posting[2])
+        )
+        with closing(iter_listing_pages("optioncarriere", url, parse_optioncarriere_listing, existing_links, parser, crawled=crawled)) as pages:
+            for page, postings in pages:
+                if watermarks.page_reached("optioncarriere", keyword, postings):
+                    logging.info(f"Reached previously crawled optioncarriere postings for {keyword}")
+                    break
+
+                for title, link, publish_date, date_text, company, location, preview, contract, error in postings:
+                    try:
+                        # Skip if job already exists in database
+                        if link in existing_links:
+                            skipped_listings += 1
+                            logging.debug(f"Skipping existing job: {title}")
+                            watermarks.observe("optioncarriere", keyword, link, publish_date)
                             continue
-                    publish_date = parse_relative_date(date_text)
-                else:
-                    publish_date = datetime.now().date()
 
-                # Only fetch details for new jobs
-                description, _, _, experience = fetch_job_details(link, "optioncarriere")
+                        # Skip if job doesn't match criteria
+                        if should_exclude_job(title, ""):
+                            logging.info(f"Skipping excluded job: {title}")
+                            watermarks.observe("optioncarriere", keyword, link, publish_date)
+                            continue
+
+                        if error:
+                            logging.error(f"Error parsing job from optioncarriere: {error}")
+                            watermarks.fail("optioncarriere", keyword)
+                            continue
+
+                        if "jours" in date_text:
+                            days = int(re.search(r"(\d+)", date_text).group(1))
+                            if days > 15:
+                                watermarks.observe("optioncarriere", keyword, link, publish_date)
+                                continue
+
+                        # Only fetch details for new jobs
+                        description, _, _, experience = fetch_details(link, "optioncarriere")
                 
-                if company != "N/A":
-                    description = f"Company: {company} | {description}"
+                        if company != "N/A":
+                            description = f"Company: {company} | {description}"
 
-                desc_element = job.find("div", class_="desc")
-                if desc_element:
-                    preview = desc_element.get_text(strip=True)
-                    description = f"{preview} | {description}" if description != "N/A" else preview
+                        if preview:
+                            description = f"{preview} | {description}" if description != "N/A" else preview
 
-                contract_type = job.find("li", string=lambda text: text and ("CDI" in text or "CDD" in text))
-                if contract_type:
-                    contract_text = contract_type.get_text(strip=True)
-                    experience = f"{contract_text} | {experience}" if experience != "N/A" else contract_text
+                        if contract:
+                            experience = f"{contract} | {experience}" if experience != "N/A" else contract
 
-                jobs.append((title, link, publish_date, location, experience, description))
-                new_listings += 1
+                        jobs.append((title, link, publish_date, location, experience, description))
+                        new_listings += 1
+                        watermarks.observe("optioncarriere", keyword, link, publish_date)
 
-            except Exception as e:
-                logging.error(f"Error parsing job from optioncarriere: {str(e)}")
-                continue
+                    except Exception as e:
+                        logging.error(f"Error parsing job from optioncarriere: {str(e)}")
+                        watermarks.fail("optioncarriere", keyword)
+                        continue
 
         logging.info(f"Optioncarriere summary for {keyword}: {new_listings} new jobs, {skipped_listings} existing jobs skipped")
         return jobs
 
     except Exception as e:
         logging.error(f"Failed to fetch jobs from optioncarriere for '{keyword}': {str(e)}")
-        return []
+        # The rest of the listing is retried next run
+        watermarks.fail("optioncarriere", keyword)
+        raise FetchFailed(f"optioncarriere listing for '{keyword}' failed: {e}", jobs) from e
+
+TUNISIETRAVAIL_CATEGORY_URL = "https://www.tunisietravail.net/category/offres-d-emploi-et-recrutement/it/"
+TUNISIETRAVAIL_CATEGORIES = [
+    "developpeur/",
+    "developpeur-net-c-vb-java-jee/",
+    "developpeur-web/",
+    "ingenieur/"
+]
+TUNISIETRAVAIL_MAX_PAGES = 5
+
+# Listing pagination. Page 1 is the plain search/category URL. After a page
+# of nothing but new postings the next LISTING_PREFETCH_PAGES pages download
+# concurrently, after a partly new one just the next page; traversal stops
+# at the first page whose postings are all known, older than
+# LISTING_MAX_AGE_DAYS or at or below the source's high-water mark.
+LISTING_PAGE_URLS = {
+    "keejob": "{url}&page={page}",
+    "optioncarriere": "{url}&p={page}",
+    "tunisietravail": "{url}page/{page}/"
+}
+LISTING_MAX_PAGES = 10
+LISTING_PREFETCH_PAGES = 2
+LISTING_MAX_AGE_DAYS = 15
+
+# Separate from the crawl pool: fetchers block on these pages
+_listing_page_executor = ThreadPoolExecutor(max_workers=CRAWL_MAX_WORKERS, thread_name_prefix="listing-page")
+
+def listing_page_url(site, url, page):
+    return url if page == 1 else LISTING_PAGE_URLS[site].format(url=url, page=page)
+
+def _new_postings(postings, known_links, seen_links, cutoff, crawled=None):
+    """How many postings on a page are not known, already seen, too old or skipped by crawled"""
+    def is_new(posting):
+        _, link, publish_date, *_ = posting
+        return not (
+            link in known_links or link in seen_links
+            or (cutoff is not None and publish_date < cutoff)
+            or (crawled is not None and crawled(posting))
+        )
+    return sum(map(is_new, postings))
 
-def fetch_jobs_from_tunisietravail(keyword, existing_links):
-    """Enhanced tunisietravail job fetching with duplicate prevention"""
-    base_url = "https://www.tunisietravail.net/category/offres-d-emploi-et-recrutement/it/"
-    
-    it_categories = [
-        "developpeur/",
-        "developpeur-net-c-vb-java-jee/",
-        "developpeur-web/",
-        "ingenieur/"
-    ]
-    
-    jobs = []
-    new_listings = 0
-    skipped_listings = 0
-    logging.info(f"Fetching IT jobs from tunisietravail")
-    
+def iter_listing_pages(site, url, parse_func, known_links=(), parser=None,
+                       max_pages=LISTING_MAX_PAGES, max_age_days=LISTING_MAX_AGE_DAYS, crawled=None):
+    """
+    Yield (page, postings) for the pages of a listing, parsed by parse_func
+    (postings are tuples starting with title, link, publish_date). The
+    optional crawled(posting) predicate marks postings that need no work:
+    covered by a previous run, or rejected by the caller's title filter.
+    A page with nothing else on it ends the listing, so postings that are
+    never stored don't keep every run walking to max_pages. Use within
+    closing(): a caller that stops early drops the pages still in flight.
+    A 404 after page 1 is the end of the pagination; any other error
+    propagates after the pages before it, so the caller can keep its
+    high-water mark (CrawlWatermarks.fail) and retry the rest next run.
+    """
+    def fetch(page):
+        response = make_request(listing_page_url(site, url, page))
+        return parse_response(response, parse_func, parser=parser)
+
+    cutoff = datetime.now().date() - timedelta(days=max_age_days) if max_age_days else None
+    seen_links = set()
+    pending = {1: _listing_page_executor.submit(fetch, 1)}
     try:
-        session = create_session()
-        
-        for category in it_categories:
-            category_url = base_url + category
+        for page in range(1, max_pages + 1):
             try:
-                response = make_request(category_url, session)
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                job_listings = soup.find_all("div", class_="Post")
-                logging.info(f"Found {len(job_listings)} potential jobs in category {category}")
-                
-                for job in job_listings:
+                postings = pending.pop(page).result()
+            except requests.exceptions.HTTPError as e:
+                if page == 1 or e.response is None or e.response.status_code != 404:
+                    raise
+                logging.info(f"{site} listing {url} ends at page {page}: {e}")
+                return
+
+            new = _new_postings(postings, known_links, seen_links, cutoff, crawled)
+            seen_links.update(posting[1] for posting in postings)
+            exhausted = new == 0
+            # Only a page with something new earns the pages after it
+            ahead = LISTING_PREFETCH_PAGES if new == len(postings) else 1
+            for next_page in range(page + 1, min(page + ahead, max_pages) + 1):
+                if not exhausted and next_page not in pending:
+                    pending[next_page] = _listing_page_executor.submit(fetch, next_page)
+
+            yield page, postings
+
+            if exhausted or page + 1 not in pending:
+                if page > 1:
+                    logging.info(f"{site} listing {url}: stopped after {page} pages")
+                return
+    finally:
+        for future in pending.values():
+            future.cancel()
+
+def parse_tunisietravail_listing(body, encoding):
+    """(title, link, publish_date, preview_text) per posting on a tunisietravail category page"""
+    soup = parse_html(decode_html(body, encoding), "tunisietravail", "listing")
+    postings = []
+
+    for job in SELECTORS["tunisietravail_posting"].select(soup):
+        try:
+            title_tag = job.find("a", class_="h1titleall")
+            if not title_tag:
+                continue
+
+            title = title_tag.text.strip()
+            link = title_tag["href"]
+
+            date_section = job.find("p", class_="PostDateIndex")
+            publish_date = datetime.now().date()
+            if date_section:
+                month_tag = date_section.find("strong", class_="month")
+                if month_tag:
+                    month_text = month_tag.text.strip()
                     try:
-                        title_tag = job.find("a", class_="h1titleall")
-                        if not title_tag:
-                            continue
-                        
-                        title = title_tag.text.strip()
-                        link = title_tag["href"]
+                        publish_date = datetime.strptime(month_text, "%b, %Y").date()
+                    except ValueError:
+                        publish_date = parse_relative_date(month_text)
 
-                        # Skip if job already exists
-                        if link in existing_links:
-                            skipped_listings += 1
-                            logging.debug(f"Skipping existing job: {title}")
-                            continue
-                        
-                        # Skip if job title doesn't match keywords
-                        if not any(kw.lower() in title.lower() for kw in KEYWORDS['core'] + KEYWORDS['job_titles']):
+            desc_preview = SELECTORS["tunisietravail_preview"].select_one(job)
+            preview_text = desc_preview.text.strip() if desc_preview else ""
+
+            postings.append((title, link, publish_date, preview_text))
+
+        except Exception as e:
+            logging.error(f"Error parsing job listing: {str(e)}")
+            continue
+
+    return postings
+
+def fetch_tunisietravail_listings(watermarks=None, parser=None, existing_links=()):
+    """
+    Download every tunisietravail category listing (following pagination)
+    once per run. Returns (listings, failed_categories): (title, link,
+    publish_date, preview_text, category) tuples that
+    fetch_jobs_from_tunisietravail matches keywords against, and the
+    categories that could not be read completely (their marks are kept).
+    Categories are sorted newest first, so with watermarks each one stops
+    at the newest posting of the last run.
+    """
+    listings = []
+    failed_categories = []
+    seen_links = set()
+    logging.info("Fetching IT job listings from tunisietravail")
+
+    for category in TUNISIETRAVAIL_CATEGORIES:
+        category_url = TUNISIETRAVAIL_CATEGORY_URL + category
+        reached_mark = False
+        # Dates are month-precise here, too coarse for the age cutoff. Titles
+        # fetch_jobs_from_tunisietravail would reject don't make a page new.
+        pages = iter_listing_pages(
+            "tunisietravail", category_url, parse_tunisietravail_listing, existing_links,
+            parser, max_pages=TUNISIETRAVAIL_MAX_PAGES, max_age_days=None,
+            crawled=lambda posting: not title_matches_keywords(posting[0])
+        )
+        try:
+            with closing(pages):
+                for page, postings in pages:
+                    logging.info(f"Found {len(postings)} potential jobs in category {category} page {page}")
+
+                    for title, link, publish_date, preview_text in postings:
+                        if link in seen_links:
                             continue
-                        
-                        date_section = job.find("p", class_="PostDateIndex")
-                        publish_date = datetime.now().date()
-                        if date_section:
-                            month_tag = date_section.find("strong", class_="month")
-                            if month_tag:
-                                month_text = month_tag.text.strip()
-                                try:
-                                    publish_date = datetime.strptime(month_text, "%b, %Y").date()
-                                except ValueError:
-                                    publish_date = parse_relative_date(month_text)
-                        
-                        desc_preview = job.find("div", style=lambda x: x and "line-height:18px" in x)
-                        preview_text = desc_preview.text.strip() if desc_preview else ""
-                        
-                        description, _, location, experience = fetch_job_details(link, "tunisietravail")
-                        full_description = f"{preview_text} | {description}" if description != "N/A" else preview_text
-                        
-                        jobs.append((title, link, publish_date.strftime("%Y-%m-%d"), location, experience, full_description))
-                        new_listings += 1
-                        
-                    except Exception as e:
-                        logging.error(f"Error parsing job listing: {str(e)}")
-                        continue
-                        
-            except Exception as e:
-                logging.error(f"Error fetching category {category}: {str(e)}")
+                        seen_links.add(link)
+
+                        if watermarks is not None:
+                            if watermarks.reached("tunisietravail", category, link, publish_date):
+                                logging.info(f"Reached previously crawled tunisietravail postings in {category}")
+                                watermarks.count_stop()
+                                reached_mark = True
+                                break
+                            # Held back by fetch_jobs_from_tunisietravail if its details fail
+                            watermarks.observe("tunisietravail", category, link, publish_date)
+
+                        listings.append((title, link, publish_date, preview_text, category))
+
+                    if reached_mark:
+                        break
+        except Exception as e:
+            logging.error(f"Error fetching category {category}: {str(e)}")
+            failed_categories.append(category)
+            if watermarks is not None:
+                watermarks.fail("tunisietravail", category)
+
+    logging.info(f"Tunisietravail listing stage: {len(listings)} unique postings")
+    if failed_categories:
+        logging.warning(f"Tunisietravail categories not read completely: {', '.join(failed_categories)}")
+    return listings, failed_categories
+
+def fetch_jobs_from_tunisietravail(keyword, existing_links, listings=None, failed_categories=(),
+                                   registry=None, watermarks=None, parser=None):
+    """
+    Match a keyword against the per-run tunisietravail listings and fetch
+    details for the new postings whose title contains it. Raises FetchFailed
+    (with those jobs) if some categories could not be listed.
+    """
+    fetch_details = registry.fetch_details if registry else partial(fetch_job_details, parser=parser)
+    if listings is None:
+        listings, failed_categories = fetch_tunisietravail_listings(watermarks=watermarks, parser=parser)
+
+    keyword_lower = keyword.lower()
+    jobs = []
+    new_listings = 0
+    skipped_listings = 0
+
+    for title, link, publish_date, preview_text, category in listings:
+        try:
+            title_lower = title.lower()
+            if keyword_lower not in title_lower:
                 continue
 
-        logging.info(f"Tunisietravail summary: {new_listings} new jobs, {skipped_listings} existing jobs skipped")
-        return jobs
-        
-    except Exception as e:
-        logging.error(f"Failed to fetch jobs from tunisietravail: {str(e)}")
-        return []
+            # Skip if job already exists
+            if link in existing_links:
+                skipped_listings += 1
+                logging.debug(f"Skipping existing job: {title}")
+                continue
+            
+            # Skip if job title doesn't match keywords
+            if not title_matches_keywords(title):
+                continue
+            
+            description, _, location, experience = fetch_details(link, "tunisietravail")
+            full_description = f"{preview_text} | {description}" if description != "N/A" else preview_text
+            
+            jobs.append((title, link, publish_date.strftime("%Y-%m-%d"), location, experience, full_description))
+            new_listings += 1
+            
+        except Exception as e:
+            logging.error(f"Error parsing job listing: {str(e)}")
+            if watermarks is not None:
+                watermarks.fail("tunisietravail", category)
+            continue
+
+    logging.info(f"Tunisietravail summary for {keyword}: {new_listings} new jobs, {skipped_listings} existing jobs skipped")
+    if failed_categories:
+        raise FetchFailed(f"tunisietravail categories not listed: {', '.join(failed_categories)}", jobs)
+    return jobs
+
+def parse_keejob_listing(body, encoding):
+    """
+    Postings on a keejob search page as (title, link, publish_date, location,
+    error) tuples; `error` is set when the secondary fields could not be read
+    """
+    soup = parse_html(decode_html(body, encoding), "keejob", "listing")
+    postings = []
+
+    for job in SELECTORS["keejob_posting"].select(soup):
+        try:
+            title_tag = job.find("a", style="color: #005593;")
+            if not title_tag:
+                continue
+
+            title = title_tag.text.strip()
+            link = f"https://www.keejob.com{title_tag['href']}"
+
+            date_div = job.find("div", class_="meta_a")
+            publish_date = datetime.now().date()
+            if date_div:
+                date_text = date_div.find("i", class_="fa-clock-o").next_sibling.strip()
+                publish_date = datetime.strptime(date_text, "%d/%m/%Y").date()
+        except Exception as e:
+            logging.error(f"Error parsing job from keejob: {str(e)}")
+            continue
 
-def fetch_jobs_from_keejob(keyword, existing_links):
+        location = error = None
+        try:
+            content_div = job.find("div", class_="content")
+            company = "N/A"
+            if content_div:
+                company_text = content_div.find("div", class_="span12").get_text(strip=True)
+                if company_text:
+                    company = company_text.split('|')[0].strip()
+
+            location_tag = job.find("i", class_="fa-map-marker")
+            location = location_tag.next_sibling.strip() if location_tag else "N/A"
+        except Exception as e:
+            error = str(e)
+
+        postings.append((title, link, publish_date, location, error))
+
+    return postings
+
+def fetch_jobs_from_keejob(keyword, existing_links, registry=None, watermarks=None, parser=None):
     """Enhanced keejob job fetching with duplicate prevention"""
+    fetch_details = registry.fetch_details if registry else partial(fetch_job_details, parser=parser)
+    watermarks = watermarks if watermarks is not None else CrawlWatermarks()
     url = BASE_URLS["keejob"].format(query=keyword)
     logging.info(f"Fetching jobs from keejob for keyword: {keyword}")
-    
+    jobs = []
+
     try:
-        session = create_session()
-        response = make_request(url, session)
-        soup = BeautifulSoup(response.text, "html.parser")
-        jobs = []
         new_listings = 0
         skipped_listings = 0
 
-        job_listings = soup.find_all("div", class_="block_white_a")
-        logging.info(f"Found {len(job_listings)} potential jobs for '{keyword}' on keejob")
-
-        for job in job_listings:
-            try:
-                title_tag = job.find("a", style="color: #005593;")
-                if not title_tag:
-                    continue
-
-                title = title_tag.text.strip()
-                link = f"https://www.keejob.com{title_tag['href']}"
-
-                # Skip if job already exists
-                if link in existing_links:
-                    skipped_listings += 1
-                    logging.debug(f"Skipping existing job: {title}")
-                    continue
+        # Results are ranked by relevance: only a page entirely at or below
+        # last run's mark, or with off-topic titles, ends the listing
+        crawled = lambda posting: (
+            not title_matches_keywords(posting[0])
+            or watermarks.reached("keejob", keyword, posting[1], posting[2])
+        )
+        with closing(iter_listing_pages("keejob", url, parse_keejob_listing, existing_links, parser, crawled=crawled)) as pages:
+            for page, postings in pages:
+                logging.info(f"Found {len(postings)} potential jobs for '{keyword}' on keejob page {page}")
+                if watermarks.page_reached("keejob", keyword, postings):
+                    logging.info(f"Reached previously crawled keejob postings for {keyword}")
+                    break
+
+                for title, link, publish_date, location, error in postings:
+                    try:
+                        # Skip if job already exists
+                        if link in existing_links:
+                            skipped_listings += 1
+                            logging.debug(f"Skipping existing job: {title}")
+                            watermarks.observe("keejob", keyword, link, publish_date)
+                            continue
                 
-                # Skip if job title doesn't match keywords
-                if not any(kw.lower() in title.lower() for kw in KEYWORDS['core'] + KEYWORDS['job_titles']):
-                    continue
-
-                content_div = job.find("div", class_="content")
-                company = "N/A"
-                if content_div:
-                    company_text = content_div.find("div", class_="span12").get_text(strip=True)
-                    if company_text:
-                        company = company_text.split('|')[0].strip()
-
-                location_tag = job.find("i", class_="fa-map-marker")
-                location = location_tag.next_sibling.strip() if location_tag else "N/A"
+                        # Skip if job title doesn't match keywords
+                        if not title_matches_keywords(title):
+                            watermarks.observe("keejob", keyword, link, publish_date)
+                            continue
 
-                date_div = job.find("div", class_="meta_a")
-                publish_date = datetime.now().date()
-                if date_div:
-                    date_text = date_div.find("i", class_="fa-clock-o").next_sibling.strip()
-                    publish_date = datetime.strptime(date_text, "%d/%m/%Y").date()
+                        if error:
+                            logging.error(f"Error parsing job from keejob: {error}")
+                            watermarks.fail("keejob", keyword)
+                            continue
 
-                description, _, _, experience = fetch_job_details(link, "keejob")
+                        description, _, _, experience = fetch_details(link, "keejob")
                 
-                jobs.append((title, link, publish_date, location, experience, description))
-                new_listings += 1
+                        jobs.append((title, link, publish_date, location, experience, description))
+                        new_listings += 1
+                        watermarks.observe("keejob", keyword, link, publish_date)
 
-            except Exception as e:
-                logging.error(f"Error parsing job from keejob: {str(e)}")
-                continue
+                    except Exception as e:
+                        logging.error(f"Error parsing job from keejob: {str(e)}")
+                        watermarks.fail("keejob", keyword)
+                        continue
 
         logging.info(f"Keejob summary for {keyword}: {new_listings} new jobs, {skipped_listings} existing jobs skipped")
         return jobs
 
     except Exception as e:
         logging.error(f"Failed to fetch jobs from keejob for '{keyword}': {str(e)}")
-        return []
+        # The rest of the listing is retried next run
+        watermarks.fail("keejob", keyword)
+        raise FetchFailed(f"keejob listing for '{keyword}' failed: {e}", jobs) from e
     
     
-def save_job_to_db(title, link, publish_date, location, experience, description, status):
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        
+# Real UPSERT: a re-scraped posting keeps its id, status, click and
+# application state; only the scraped fields and the score are refreshed
+UPSERT_JOB_SQL = '''
+    INSERT INTO jobs (
+        title, link, publish_date, location, experience,
+        description, status, added_date, is_new, is_old,
+        relevance_score, matched_keywords, keyword_version, site
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(link) DO UPDATE SET
+        title = excluded.title,
+        publish_date = excluded.publish_date,
+        location = excluded.location,
+        experience = excluded.experience,
+        description = excluded.description,
+        is_new = excluded.is_new,
+        is_old = excluded.is_old,
+        relevance_score = excluded.relevance_score,
+        matched_keywords = excluded.matched_keywords,
+        keyword_version = excluded.keyword_version,
+        site = excluded.site
+'''
+
+JOB_WRITE_BATCH_SIZE = 200
+
+def _job_rows(jobs, status):
+    """Parameter tuples for UPSERT_JOB_SQL, scoring the whole batch at once"""
+    jobs = list(jobs)
+    scores, matches = score_jobs_batch(
+        [(job[0], job[5]) for job in jobs], return_matches=True
+    )
+    today = datetime.now().date()
+    added_date = datetime.now()
+    rows = []
+    for (title, link, publish_date, location, experience, description), score, matched in zip(jobs, scores, matches):
         # Convert publish_date to datetime if it's a string
         if isinstance(publish_date, str):
             publish_date = parse_relative_date(publish_date)
-        
+
         # Calculate job age
-        days_since_published = (datetime.now().date() - publish_date).days
-        is_new = days_since_published < 3
-        is_old = days_since_published > 15
-        
-        c.execute('''
-        INSERT OR REPLACE INTO jobs (
-            title, link, publish_date, location, experience, 
-            description, status, added_date, is_new, is_old
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            title, link, publish_date.strftime("%Y-%m-%d"), location, 
-            experience, description, status, datetime.now(), 
-            is_new, is_old
+        days_since_published = (today - publish_date).days
+        rows.append((
+            title, link, publish_date.strftime("%Y-%m-%d"), location,
+            experience, description, status, added_date,
+            days_since_published < 3, days_since_published > 15,
+            int(score), ",".join(map(str, matched)), KEYWORD_SET_VERSION,
+            site_from_link(link)
         ))
-        conn.commit()
+    return rows
+
+def write_jobs(jobs, status="new"):
+    """Upsert (title, link, publish_date, location, experience, description) tuples in one transaction"""
+    rows = _job_rows(jobs, status)
+    if not rows:
+        return 0
+    conn = get_connection()
+    with conn:
+        conn.executemany(UPSERT_JOB_SQL, rows)
+        bump_data_version(conn)
+    return len(rows)
+
+class JobWriter:
+    """
+    Buffers scraped jobs and flushes them with executemany, one transaction
+    (and one fsync) per batch instead of one per row. Use as a context
+    manager so the tail of the buffer is flushed on exit.
+    """
+
+    def __init__(self, batch_size=JOB_WRITE_BATCH_SIZE, status="new"):
+        self.batch_size = batch_size
+        self.status = status
+        self.pending = []
+        self.written = 0
+        self.batches = 0
+        self.lost = 0
+
+    def add(self, job):
+        self.pending.append(job)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        jobs, self.pending = self.pending, []
+        try:
+            self.written += write_jobs(jobs, self.status)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.lost += len(jobs)
+            logging.error(f"Database save error ({len(jobs)} jobs lost): {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+def save_job_to_db(title, link, publish_date, location, experience, description, status):
+    try:
+        write_jobs([(title, link, publish_date, location, experience, description)], status)
     except sqlite3.Error as e:
         logging.error(f"Database save error: {e}")
-    finally:
-        conn.close()
 
-def update_jobs_with_logging():
+RESCORE_CHUNK_SIZE = 2000
+
+def rescore_jobs(chunk_size=RESCORE_CHUNK_SIZE, force=False):
+    """
+    Recompute relevance_score/matched_keywords for rows scored with an older
+    keyword set (or never scored). Streams the table in id order, one
+    chunk per transaction, so it can run alongside the API and scraper.
+    """
+    started = time.monotonic()
+    rescored = 0
+    last_id = 0
     try:
-        # Existing update_jobs logic
-        update_jobs()
-        
-        # Log successful update
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         c = conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS update_log (
-            last_update DATETIME
-        )
-        ''')
-        c.execute('INSERT INTO update_log (last_update) VALUES (?)', 
-                  (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
-        conn.commit()
-        conn.close()
-        
-        logging.info("Job update completed successfully")
-    except Exception as e:
-        logging.error(f"Job update failed: {e}")
-        raise
+        while True:
+            c.execute('''
+                SELECT id, title, description FROM jobs
+                WHERE id > ? AND (? OR keyword_version IS NULL OR keyword_version != ?)
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, force, KEYWORD_SET_VERSION, chunk_size))
+            rows = c.fetchall()
+            if not rows:
+                break
+
+            scores, matches = score_jobs_batch(
+                [(title or "", description or "") for _, title, description in rows],
+                return_matches=True
+            )
+            with conn:
+                c.executemany('''
+                    UPDATE jobs
+                    SET relevance_score = ?, matched_keywords = ?, keyword_version = ?
+                    WHERE id = ?
+                ''', [
+                    (score, ",".join(map(str, matched)), KEYWORD_SET_VERSION, row[0])
+                    for row, score, matched in zip(rows, scores.tolist(), matches)
+                ])
+                bump_data_version(conn)
+
+            last_id = rows[-1][0]
+            rescored += len(rows)
+    except sqlite3.Error as e:
+        logging.error(f"Error rescoring jobs: {e}")
+
+    logging.info(f"Rescored {rescored} jobs for keyword set {KEYWORD_SET_VERSION} in {time.monotonic() - started:.2f}s")
+    return rescored
+
+def update_jobs_with_logging(trigger="cli", mode=None):
+    """Run a scrape through the scheduler and wait for it; raises if it failed"""
+    run_id, started = scrape_scheduler.start(trigger, wait=True, mode=mode)
+    if started:
+        run = get_scrape_run(run_id)
+        logging.info(f"Job update finished with status {run['status']}")
+        if run["status"] not in ("succeeded", "cancelled"):
+            raise RuntimeError(f"Job update failed ({run['status']}): {run['error'] or 'lost its slot'}")
+    return run_id
     
     
-def update_jobs():
-    """Enhanced job update process with duplicate prevention"""
+SITE_FETCHERS = {
+    "optioncarriere": fetch_jobs_from_optioncarriere,
+    "tunisietravail": fetch_jobs_from_tunisietravail,
+    "keejob": fetch_jobs_from_keejob
+}
+
+INCREMENTAL_CRAWL = True
+
+# "search" crawls every keyword on every site (update_jobs); "discovery"
+# enumerates new postings from feeds and sitemaps instead (discover_jobs)
+CRAWL_MODE = os.environ.get("CRAWL_MODE", "search")
+
+def update_jobs(max_workers=CRAWL_MAX_WORKERS, incremental=INCREMENTAL_CRAWL, run=None):
+    """
+    Enhanced job update process with duplicate prevention. In incremental
+    mode each listing is only walked down to the previous run's newest
+    posting; a full crawl still records new high-water marks. `run`
+    (a ScrapeRun) receives progress and can cancel the remaining tasks.
+    """
     logging.info("Starting job update process...")
+    started = time.monotonic()
+    reset_host_limiters()
     
     # Get existing jobs from database first
     existing_links = get_existing_job_links()
@@ -1004,50 +2753,666 @@ def update_jobs():
     total_jobs_skipped = 0
     total_jobs_processed = 0
     failed_keywords = []
+    failed_tasks = 0
 
-    for keyword in all_keywords:
-        try:
-            logging.info(f"Processing keyword: {keyword}")
-            
-            # Pass existing_links to each fetch function
-            jobs_optioncarriere = fetch_jobs_from_optioncarriere(keyword, existing_links)
-            jobs_tunisietravail = fetch_jobs_from_tunisietravail(keyword, existing_links)
-            jobs_keejob = fetch_jobs_from_keejob(keyword, existing_links)
+    # Crawler threads download; pages are parsed inline or by PARSE_WORKERS processes
+    parser = ParseStage()
 
-            all_jobs = jobs_optioncarriere + jobs_tunisietravail + jobs_keejob
-            total_jobs_processed += len(all_jobs)
-            
-            filtered_jobs = filter_jobs(all_jobs)
-            
-            for job in filtered_jobs:
-                if job[1] not in existing_links:  # Check link isn't in existing set
-                    save_job_to_db(*job, "new")
-                    total_jobs_added += 1
-                    existing_links.add(job[1])  # Add to existing set to prevent duplicates
-                else:
-                    total_jobs_skipped += 1
+    # The same posting is listed under many keywords; the registry makes
+    # sure its detail page is only fetched once during this run
+    registry = SeenLinkRegistry(parser)
+    watermarks = CrawlWatermarks.load() if incremental else CrawlWatermarks()
 
-        except Exception as e:
-            logging.error(f"Error processing keyword {keyword}: {e}")
-            failed_keywords.append(keyword)
+    writer = JobWriter()
+
+    with writer, parser, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # tunisietravail is browsed by category rather than searched, so its
+        # listings are downloaded once and every keyword is matched in memory
+        fetchers = dict(SITE_FETCHERS)
+        listings, failed_categories = fetch_tunisietravail_listings(
+            watermarks=watermarks, parser=parser, existing_links=existing_links
+        )
+        fetchers["tunisietravail"] = partial(
+            fetch_jobs_from_tunisietravail, listings=listings, failed_categories=failed_categories
+        )
+
+        # Fan out every keyword/site pair; host_slot() keeps each site
+        # under CRAWL_PER_HOST_LIMIT concurrent requests
+        futures = {
+            executor.submit(
+                fetcher, keyword, existing_links,
+                registry=registry, watermarks=watermarks, parser=parser
+            ): (keyword, site)
+            for keyword in all_keywords
+            for site, fetcher in fetchers.items()
+        }
+        if run:
+            run.begin(len(futures))
+
+        # Results are merged on this thread only, so existing_links and the
+        # database writes never race. Fetchers just read existing_links.
+        for future in as_completed(futures):
+            if run and run.cancelled:
+                # Drop the queued tasks; the ones in flight finish on their own
+                cancelled = sum(f.cancel() for f in futures)
+                logging.info(f"Run cancelled, {cancelled} keyword/site tasks dropped")
+                break
+            keyword, site = futures[future]
+            added = skipped = 0
+            error = None
+            try:
+                site_jobs = future.result()
+            except FetchFailed as e:
+                # Keep what the fetcher got before it failed
+                site_jobs, error = e.jobs, e
+            except Exception as e:
+                site_jobs, error = [], e
+            try:
+                total_jobs_processed += len(site_jobs)
+                
+                filtered_jobs = filter_jobs(site_jobs)
+                
+                for job in filtered_jobs:
+                    if job[1] not in existing_links:  # Check link isn't in existing set
+                        writer.add(job)
+                        added += 1
+                        existing_links.add(job[1])  # Add to existing set to prevent duplicates
+                    else:
+                        skipped += 1
+                total_jobs_added += added
+                total_jobs_skipped += skipped
+            except Exception as e:
+                error = e
+
+            if error:
+                logging.error(f"Error processing keyword {keyword} on {site}: {error}")
+                failed_tasks += 1
+                if keyword not in failed_keywords:
+                    failed_keywords.append(keyword)
+            if run:
+                run.advance(
+                    site, keyword, processed=len(site_jobs), added=added, skipped=skipped,
+                    failed=error is not None
+                )
 
     logging.info("Job update summary:")
     logging.info(f"Total jobs processed: {total_jobs_processed}")
     logging.info(f"New jobs added: {total_jobs_added}")
     logging.info(f"Existing jobs skipped: {total_jobs_skipped}")
+    logging.info(f"Database writes: {writer.written} jobs in {writer.batches} transactions")
+    registry_stats = registry.get_stats()
+    logging.info(f"Detail pages: {registry_stats['misses']} fetched, {registry_stats['hits']} duplicate requests served from the run registry")
+    logging.info(
+        f"Parse stage: {parser.parsed} pages parsed "
+        + (f"in {parser.workers} worker processes" if parser.workers else "on the crawler threads")
+    )
+    if run and run.cancelled:
+        # Sources cut short must be walked fully next time
+        logging.info("Run cancelled, high-water marks left unchanged")
+    elif writer.lost:
+        logging.warning(f"{writer.lost} jobs were not saved, high-water marks left unchanged")
+    else:
+        watermarks.save()
+    if incremental:
+        logging.info(f"Incremental crawl: {watermarks.stops} listings stopped at their high-water mark")
+    log_connection_stats()
+    log_host_limiter_stats()
+    cache_stats = http_cache.get_stats()
+    logging.info(
+        f"HTTP cache: {cache_stats['hits']} local hits, {cache_stats['revalidated']} revalidated (304), "
+        f"{cache_stats['misses']} downloaded, {cache_stats['entries']} entries / {cache_stats['bytes'] // 1024} KiB on disk"
+    )
+    logging.info(f"Elapsed time: {time.monotonic() - started:.1f}s with {max_workers} workers")
     if failed_keywords:
         logging.warning(f"Failed keywords: {', '.join(failed_keywords)}")
+    if futures and failed_tasks == len(futures):
+        raise RuntimeError(f"All {failed_tasks} keyword/site tasks failed")
+
+    return total_jobs_added
+
+# Discovery sources: (site, feed or sitemap URL, regex a posting URL must
+# match). tunisietravail has a WordPress RSS feed per category. Sitemaps
+# (nested indexes are followed one level down) work too, but the keejob
+# and optioncarriere sitemap locations and URL patterns have not been
+# checked against the live sites yet, so those boards stay off until they
+# are; discover_jobs warns about every site it does not cover.
+DISCOVERY_SOURCES = [
+    *[("tunisietravail", TUNISIETRAVAIL_CATEGORY_URL + category + "feed/", None) for category in TUNISIETRAVAIL_CATEGORIES],
+    # ("keejob", "https://www.keejob.com/sitemap.xml", r"/offres-emploi/\d+/"),
+    # ("optioncarriere", "https://www.optioncarriere.tn/sitemap.xml", r"/jobad/")
+]
+# Postings last modified before this are never fetched, and no source may
+# hand more than DISCOVERY_MAX_POSTINGS unseen URLs to a single run; the
+# rest come up in the following runs
+DISCOVERY_MAX_AGE_DAYS = 15
+DISCOVERY_MAX_POSTINGS = 300
+# Fetched postings are scored DISCOVERY_FILTER_BATCH at a time
+DISCOVERY_FILTER_BATCH = 50
+# Rejected postings are remembered (see record_seen_links) this long
+DISCOVERY_SEEN_TTL_DAYS = 60
+
+def _local_name(element):
+    return element.tag.rsplit("}", 1)[-1]
+
+def _child_text(element, name):
+    for child in element:
+        if _local_name(child) == name:
+            return (child.text or "").strip()
+    return ""
+
+def _feed_date(text):
+    """Sitemap <lastmod> (W3C datetime) or RSS <pubDate> (RFC 822) as YYYY-MM-DD"""
+    if re.match(r"\d{4}-\d{2}-\d{2}", text):
+        return text[:10]
+    try:
+        return parsedate_to_datetime(text).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+def parse_feed(body, encoding):
+    """
+    Entries of an RSS feed, sitemap or sitemap index as (kind, url, lastmod,
+    title, summary) tuples; kind is "sitemap" for a nested sitemap
+    """
+    root = ElementTree.fromstring(body)
+    entries = []
+    for element in root.iter():
+        name = _local_name(element)
+        if name == "item":
+            entries.append((
+                "posting", _child_text(element, "link"), _feed_date(_child_text(element, "pubDate")),
+                _child_text(element, "title") or None,
+                BeautifulSoup(_child_text(element, "description"), HTML_PARSER).get_text(" ", strip=True)
+            ))
+        elif name in ("url", "sitemap"):
+            entries.append((
+                "posting" if name == "url" else "sitemap", _child_text(element, "loc"),
+                _feed_date(_child_text(element, "lastmod")), None, ""
+            ))
+    return entries
+
+def parse_posting_page(body, encoding, site):
+    """(title, description, publish_date, location, experience) from a detail page"""
+    html = decode_html(body, encoding)
+    heading = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer(["h1", "title"]))
+    title_tag = heading.find("h1") or heading.find("title")
+    return (title_tag.get_text(strip=True) if title_tag else None, *parse_job_details(html, site))
+
+def read_feed(url, parser=None):
+    """A feed or sitemap, always revalidated with a conditional GET"""
+    response = cached_get(url, get_session(url), timeout=(30, 30), ttl=0)
+    return parse_response(response, parse_feed, parser=parser)
+
+def discover_source(site, url, pattern, existing_links, watermarks, parser=None):
+    """
+    (postings, newest) for one source: its unseen posting entries, newest
+    first, as (site, source_url, link, title, lastmod, summary) tuples and
+    the newest lastmod it lists. Entries last modified before the source's
+    previous high-water mark or DISCOVERY_MAX_AGE_DAYS ago are left out, as
+    are RSS items whose title matches no keyword. newest is None when the
+    source had to be truncated, so the skipped entries come up again;
+    existing_links should hold the links already rejected (get_seen_links)
+    as well, so the next run moves on to the following entries.
+    """
+    mark = watermarks.mark(site, url)
+    since = max(
+        (datetime.now().date() - timedelta(days=DISCOVERY_MAX_AGE_DAYS)).strftime("%Y-%m-%d"),
+        mark[1] if mark and mark[1] else ""
+    )
+    entries = read_feed(url, parser)
+    # One level of sitemap index
+    for kind, child_url, lastmod, _, _ in list(entries):
+        if kind == "sitemap" and (lastmod is None or lastmod >= since):
+            try:
+                entries.extend(read_feed(child_url, parser))
+            except Exception as e:
+                logging.error(f"Error reading sitemap {child_url}: {e}")
+
+    postings = {}
+    newest = None
+    for kind, link, lastmod, title, summary in entries:
+        if kind != "posting" or not link or (pattern and not re.search(pattern, link)):
+            continue
+        if lastmod and (newest is None or lastmod > newest):
+            newest = lastmod
+        if link in existing_links or link in postings or (lastmod and lastmod < since):
+            continue
+        if title and not title_matches_keywords(title):
+            continue
+        postings[link] = (site, url, link, title, lastmod, summary)
+
+    found = sorted(postings.values(), key=lambda posting: posting[4] or "", reverse=True)
+    if len(found) > DISCOVERY_MAX_POSTINGS:
+        logging.warning(f"{url}: {len(found)} unseen postings, keeping the newest {DISCOVERY_MAX_POSTINGS}")
+        found = found[:DISCOVERY_MAX_POSTINGS]
+        newest = None
+    logging.info(f"Discovered {len(found)} unseen postings in {url}")
+    return found, newest
+
+def get_seen_links():
+    """Links discovery fetched and rejected, so they are not fetched again"""
+    try:
+        c = get_connection().cursor()
+        c.execute('SELECT link FROM seen_links')
+        return set(row[0] for row in c.fetchall())
+    except sqlite3.Error as e:
+        logging.error(f"Error fetching seen links: {e}")
+        return set()
+
+def record_seen_links(links):
+    """Remember rejected (site, link) pairs and forget ones past DISCOVERY_SEEN_TTL_DAYS"""
+    try:
+        conn = get_connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO seen_links (link, site, seen_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                [(link, site) for site, link in links]
+            )
+            conn.execute(
+                "DELETE FROM seen_links WHERE seen_at < datetime('now', ?)",
+                (f"-{DISCOVERY_SEEN_TTL_DAYS} days",)
+            )
+    except sqlite3.Error as e:
+        logging.error(f"Error recording seen links: {e}")
+
+def fetch_discovered_posting(posting, parser=None):
+    """Job tuple ready for filter_jobs / JobWriter, None if it has no title"""
+    site, _, link, feed_title, lastmod, summary = posting
+    response = cached_get(link, get_session(link), timeout=10, ttl=DETAIL_CACHE_TTL)
+    title, description, publish_date, location, experience = parse_response(
+        response, parse_posting_page, site, parser=parser
+    )
+    title = feed_title or title
+    if not title:
+        return None
+    if summary:
+        description = f"{summary} | {description}" if description != "N/A" else summary
+    # keejob pages give dd/mm/yyyy, tunisietravail pages no date at all
+    if isinstance(publish_date, str):
+        try:
+            publish_date = datetime.strptime(publish_date, "%d/%m/%Y").date()
+        except ValueError:
+            publish_date = None
+    if not publish_date:
+        publish_date = lastmod or datetime.now().date()
+    return (title, link, publish_date, location, experience, description)
+
+def discover_jobs(max_workers=CRAWL_MAX_WORKERS, run=None):
+    """
+    Discovery crawl: enumerate posting URLs from DISCOVERY_SOURCES (with
+    conditional GETs), fetch only the ones not in the database and not
+    rejected before, and keep those filter_jobs scores as relevant.
+    Requests grow with the number of new postings, not with the keyword list.
+    """
+    logging.info("Starting job discovery...")
+    started = time.monotonic()
+    reset_host_limiters()
+    uncovered = set(SITE_FETCHERS) - {site for site, _, _ in DISCOVERY_SOURCES}
+    if uncovered:
+        logging.warning(f"No discovery source for {', '.join(sorted(uncovered))}; only search mode crawls them")
+    existing_links = get_existing_job_links()
+    known_links = existing_links | get_seen_links()
+    watermarks = CrawlWatermarks.load()
+    parser = ParseStage()
+    writer = JobWriter()
+    postings = {}
+    newest = {}
+    failed_sources = []
+    failed_postings = 0
+    pending = []
+    rejected = []
+    total_jobs_added = 0
+    total_jobs_processed = 0
+
+    def flush():
+        # Score the fetched postings in one batch; the rejected ones are
+        # remembered so later runs neither fetch them nor stall on them
+        nonlocal total_jobs_added
+        kept = {job[1] for job in filter_jobs([job for _, job in pending if job])}
+        for posting, job in pending:
+            site, link = posting[0], posting[2]
+            added = 0
+            if link not in kept:
+                rejected.append((site, link))
+            elif link not in existing_links:
+                writer.add(job)
+                existing_links.add(link)
+                added = 1
+            total_jobs_added += added
+            if run:
+                run.advance(site, "discovery", processed=1, added=added, skipped=1 - added)
+        pending.clear()
+
+    with writer, parser, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(discover_source, site, url, pattern, known_links, watermarks, parser): url
+            for site, url, pattern in DISCOVERY_SOURCES
+        }
+        for future in as_completed(futures):
+            try:
+                found, newest[futures[future]] = future.result()
+                # A post filed under several categories is fetched once
+                for posting in found:
+                    postings.setdefault(posting[2], posting)
+            except Exception as e:
+                logging.error(f"Error reading discovery source {futures[future]}: {e}")
+                failed_sources.append(futures[future])
+
+        futures = {executor.submit(fetch_discovered_posting, posting, parser): posting for posting in postings.values()}
+        if run:
+            # A source that could not be read counts as one failed task
+            run.begin(len(futures) + len(failed_sources))
+            for site, url, _ in DISCOVERY_SOURCES:
+                if url in failed_sources:
+                    run.advance(site, url, failed=True)
+
+        for future in as_completed(futures):
+            if run and run.cancelled:
+                cancelled = sum(f.cancel() for f in futures)
+                logging.info(f"Run cancelled, {cancelled} postings dropped")
+                break
+            posting = futures[future]
+            try:
+                pending.append((posting, future.result()))
+                total_jobs_processed += 1
+            except Exception as e:
+                logging.error(f"Error fetching discovered posting {posting[2]}: {e}")
+                failed_postings += 1
+                # Retried next run: the source's mark must not move past it
+                newest[posting[1]] = None
+                if run:
+                    run.advance(posting[0], "discovery", failed=True)
+            if len(pending) >= DISCOVERY_FILTER_BATCH:
+                flush()
+        flush()
+
+    logging.info("Job discovery summary:")
+    logging.info(f"Unseen postings fetched: {total_jobs_processed}")
+    logging.info(f"New jobs added: {total_jobs_added}")
+    logging.info(f"Rejected postings remembered: {len(rejected)}")
+    logging.info(f"Database writes: {writer.written} jobs in {writer.batches} transactions")
+    record_seen_links(rejected)
+    if run and run.cancelled:
+        logging.info("Run cancelled, source high-water marks left unchanged")
+    elif writer.lost:
+        logging.warning(f"{writer.lost} jobs were not saved, source high-water marks left unchanged")
+    else:
+        for site, url, _ in DISCOVERY_SOURCES:
+            if newest.get(url):
+                watermarks.observe(site, url, None, newest[url])
+        watermarks.save()
+    log_host_limiter_stats()
+    logging.info(f"Elapsed time: {time.monotonic() - started:.1f}s")
+    if failed_sources:
+        logging.warning(f"Failed sources: {', '.join(failed_sources)}")
+    if (failed_sources and len(failed_sources) == len(DISCOVERY_SOURCES)) or (futures and failed_postings == len(futures)):
+        raise RuntimeError("Every discovery source or posting fetch failed")
 
     return total_jobs_added
 
+# A 'running' row whose heartbeat is older than this belongs to a process
+# that died; it no longer blocks new runs. A live run writes its heartbeat
+# every SCRAPE_RUN_HEARTBEAT_INTERVAL seconds from its own thread, whatever
+# stage the crawl is in.
+SCRAPE_RUN_STALE_AFTER = 600
+SCRAPE_RUN_HEARTBEAT_INTERVAL = 30
+SCRAPE_RUN_SAVE_INTERVAL = 5
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+class ScrapeRun:
+    """
+    Progress of one update_jobs() run, persisted to scrape_runs so the API
+    (or another process) can follow and cancel it. The crawl thread updates
+    the counters and a heartbeat thread saves them periodically. A run whose
+    row is no longer 'running' (marked abandoned by another process) has
+    lost its slot: it is cancelled and writes nothing more.
+    """
+
+    def __init__(self, run_id, trigger):
+        self.id = run_id
+        self.trigger = trigger
+        self.cancel_event = threading.Event()
+        self.lost = False
+        self.done = 0
+        self.total = 0
+        self.sites = {}
+        self.failed_keywords = []
+        self._saved_at = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat = None
+
+    def start_heartbeat(self):
+        self._heartbeat = threading.Thread(target=self._beat, name=f"scrape-run-{self.id}-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def stop_heartbeat(self):
+        self._stopped.set()
+        if self._heartbeat:
+            self._heartbeat.join()
+
+    def _beat(self):
+        while not self._stopped.wait(SCRAPE_RUN_HEARTBEAT_INTERVAL):
+            self.save()
+            if self.lost:
+                return
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def begin(self, total):
+        with self._lock:
+            self.total = total
+        self.save()
+
+    def advance(self, site, keyword, processed=0, added=0, skipped=0, failed=False):
+        """Count one finished keyword/site task"""
+        with self._lock:
+            counters = self.sites.setdefault(
+                site, {"processed": 0, "added": 0, "skipped": 0, "failed": 0}
+            )
+            counters["processed"] += processed
+            counters["added"] += added
+            counters["skipped"] += skipped
+            if failed:
+                counters["failed"] += 1
+                if keyword not in self.failed_keywords:
+                    self.failed_keywords.append(keyword)
+            self.done += 1
+        if time.monotonic() - self._saved_at >= SCRAPE_RUN_SAVE_INTERVAL:
+            self.save()
+
+    def save(self, **columns):
+        """
+        Write progress and a heartbeat; also picks up a cancel requested
+        elsewhere. Returns False once the run has lost its row.
+        """
+        if self.lost:
+            return False
+        with self._lock:
+            self._saved_at = time.monotonic()
+            columns.update(
+                progress_done=self.done,
+                progress_total=self.total,
+                jobs_processed=sum(c["processed"] for c in self.sites.values()),
+                jobs_added=sum(c["added"] for c in self.sites.values()),
+                jobs_skipped=sum(c["skipped"] for c in self.sites.values()),
+                site_counters=json.dumps(self.sites),
+                failed_keywords=json.dumps(self.failed_keywords),
+                heartbeat_at=_now()
+            )
+        try:
+            conn = get_connection()
+            with conn:
+                c = conn.execute(
+                    f"UPDATE scrape_runs SET {', '.join(f'{name} = ?' for name in columns)} "
+                    f"WHERE id = ? AND status = 'running'",
+                    (*columns.values(), self.id)
+                )
+            if c.rowcount == 0:
+                logging.error(f"Scrape run {self.id} is no longer 'running' in the database, stopping it")
+                self.lost = True
+                self.cancel_event.set()
+                return False
+            row = conn.execute("SELECT cancel_requested FROM scrape_runs WHERE id = ?", (self.id,)).fetchone()
+            if row and row[0]:
+                self.cancel_event.set()
+        except sqlite3.Error as e:
+            logging.error(f"Error saving scrape run {self.id}: {e}")
+        return True
+
+def _claim_scrape_run(trigger, mode=None):
+    """
+    Insert a 'running' row unless a live run exists, in any process. The
+    check and the insert are one statement, so two callers can't both win.
+    Returns the new run id, or None.
+    """
+    now = datetime.now()
+    stale_before = (now - timedelta(seconds=SCRAPE_RUN_STALE_AFTER)).strftime('%Y-%m-%d %H:%M:%S')
+    now = now.strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "UPDATE scrape_runs SET status = 'abandoned', finished_at = ? WHERE status = 'running' AND heartbeat_at < ?",
+            (now, stale_before)
+        )
+        c = conn.execute('''
+            INSERT INTO scrape_runs (trigger, mode, status, started_at, heartbeat_at)
+            SELECT ?, ?, 'running', ?, ?
+            WHERE NOT EXISTS (SELECT 1 FROM scrape_runs WHERE status = 'running')
+        ''', (trigger, mode, now, now))
+    return c.lastrowid if c.rowcount == 1 else None
+
+def get_scrape_run(run_id):
+    """A scrape_runs row as a dict, None if unknown"""
+    runs = list_scrape_runs(run_id=run_id)
+    return runs[0] if runs else None
+
+def list_scrape_runs(limit=20, run_id=None):
+    conn = get_connection()
+    c = conn.execute(
+        f"SELECT * FROM scrape_runs {'WHERE id = ?' if run_id is not None else ''} ORDER BY id DESC LIMIT ?",
+        (run_id, limit) if run_id is not None else (limit,)
+    )
+    names = [column[0] for column in c.description]
+    runs = []
+    for row in c.fetchall():
+        run = dict(zip(names, row))
+        run["site_counters"] = json.loads(run["site_counters"] or "{}")
+        run["failed_keywords"] = json.loads(run["failed_keywords"] or "[]")
+        run["cancel_requested"] = bool(run["cancel_requested"])
+        run["progress"] = round(run["progress_done"] / run["progress_total"], 3) if run["progress_total"] else None
+        runs.append(run)
+    return runs
+
+class ScrapeScheduler:
+    """
+    Single-flight entry point for scrape runs: the API, the daily loop and
+    the CLI all go through start(), which returns the live run's id instead
+    of starting a second one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = None
+
+    def start(self, trigger="manual", wait=False, mode=None):
+        """
+        Returns (run_id, started); run_id is the live run when started is
+        False. `mode` is "search" or "discovery", CRAWL_MODE by default.
+        """
+        mode = mode or CRAWL_MODE
+        with self._lock:
+            if self.current:
+                return self.current.id, False
+            run_id = _claim_scrape_run(trigger, mode)
+            if run_id is None:
+                live = get_connection().execute(
+                    "SELECT id FROM scrape_runs WHERE status = 'running' ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+                logging.info("A scrape run is already in progress, not starting another")
+                return (live[0] if live else None), False
+            run = self.current = ScrapeRun(run_id, trigger)
+
+        thread = threading.Thread(target=self._execute, args=(run, mode), name=f"scrape-run-{run_id}", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return run_id, True
+
+    def _execute(self, run, mode):
+        logging.info(f"Scrape run {run.id} started ({run.trigger}, {mode})")
+        run.start_heartbeat()
+        try:
+            if mode == "discovery":
+                discover_jobs(run=run)
+            else:
+                update_jobs(run=run)
+            run.stop_heartbeat()
+            status = "cancelled" if run.cancelled else "succeeded"
+            if not run.save(status=status, finished_at=_now()):
+                logging.error(f"Scrape run {run.id} lost its slot before finishing")
+                return
+            if status == "succeeded":
+                conn = get_connection()
+                with conn:
+                    conn.execute('INSERT INTO update_log (last_update) VALUES (?)', (_now(),))
+            logging.info(f"Scrape run {run.id} {status}")
+        except Exception as e:
+            logging.error(f"Scrape run {run.id} failed: {e}")
+            run.stop_heartbeat()
+            run.save(status="failed", finished_at=_now(), error=str(e))
+        finally:
+            with self._lock:
+                self.current = None
+
+    def cancel(self, run_id):
+        """Ask a live run to stop; works for runs owned by other processes too"""
+        with self._lock:
+            if self.current and self.current.id == run_id:
+                self.current.cancel_event.set()
+        conn = get_connection()
+        with conn:
+            c = conn.execute(
+                "UPDATE scrape_runs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+                (run_id,)
+            )
+        return c.rowcount == 1
+
+scrape_scheduler = ScrapeScheduler()
+
+
 
 if __name__ == "__main__":
     initialize_db()
-    update_jobs_with_logging()
 
+    # `python job_scraper.py rescore [--force]` only refreshes stored scores
+    if len(sys.argv) > 1 and sys.argv[1] == "rescore":
+        rescore_jobs(force="--force" in sys.argv)
+        sys.exit(0)
+
+    # `python job_scraper.py rebuild-stats` recomputes the materialized stats,
+    # e.g. after editing jobs or application_history by hand
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild-stats":
+        conn = get_connection()
+        with conn:
+            rebuild_application_stats(conn.cursor())
+            bump_data_version(conn)
+        sys.exit(0)
+
+    # `python job_scraper.py check-plans` fails if a hot query lost its index
+    if len(sys.argv) > 1 and sys.argv[1] == "check-plans":
+        sys.exit(1 if check_query_plans() else 0)
+
+    # `python job_scraper.py discover` runs one feed/sitemap discovery crawl
+    if len(sys.argv) > 1 and sys.argv[1] == "discover":
+        update_jobs_with_logging(mode="discovery")
+        sys.exit(0)
 
     while True:
-        
-        update_jobs()
+        update_jobs_with_logging()
         logging.info("Job list updated. Sleeping for 24 hours...")
         time.sleep(86400)
\ No newline at end of file
@@ -1,22 +1,38 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import sqlite3
 from datetime import datetime
 import time
 import threading
+import asyncio
+import base64
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
 from typing import Optional, List, Dict, Any, Tuple
 from job_scraper import (
-    initialize_db, update_jobs, KEYWORDS, 
-    get_application_stats, get_applied_job_links,
-    record_application_attempt
+    initialize_db, KEYWORDS, 
+    get_application_stats, get_daily_application_stats, get_applied_job_links,
+    record_application_attempt, rescore_jobs, get_connection, site_from_link,
+    UNAPPLIED_JOBS_QUERY, UNAPPLIED_JOBS_PARAMS, APPLIED_COUNT_QUERY,
+    search_available, fts_query, SEARCH_COLUMN_WEIGHTS, open_connection,
+    scrape_scheduler, get_scrape_run, list_scrape_runs,
+    get_data_version, bump_data_version
 )
 import uvicorn
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException
+)
 import os
 from twocaptcha import TwoCaptcha
 import logging
@@ -52,12 +68,16 @@ class Job(BaseModel):
     application_attempts: Optional[int]
     last_application_date: Optional[str]
     application_success: Optional[bool]
+    relevance_score: Optional[int] = None
 
-class ApplicationStats(BaseModel):
+class ApplicationTotals(BaseModel):
     total_applications: int
     successful_applications: int
     failed_applications: int
     total_attempts: int
+
+class ApplicationStats(BaseModel):
+    overall: ApplicationTotals
     by_site: Dict[str, Dict[str, int]]
 
 class AutomationStatus(BaseModel):
@@ -72,8 +92,92 @@ class ApplicationAttempt(BaseModel):
     site_type: str
     error_message: Optional[str]
 
+# Event-driven waits in the apply_to_* flows (see JobAutomator.wait_for)
+STEP_TIMEOUT = 10
+PAGE_TIMEOUT = 20
+CLOUDFLARE_TIMEOUT = 30
+WAIT_POLL_INTERVAL = 0.2
+# A page counts as loaded once no new resource has been requested for this long
+NETWORK_QUIET_SECONDS = 0.5
+
+def visible_text(driver):
+    """Lowercased text of the page as shown, without markup, class names or scripts"""
+    return driver.find_element(By.TAG_NAME, "body").text.lower()
+
+def new_message(text, before, messages):
+    """The first of messages that is in text but was not in before, or None"""
+    return next((message for message in messages if message in text and message not in before), None)
+
+def form_submitted(button, url, before, messages):
+    """
+    Wait condition for a form submit: the page navigated away (button went
+    stale or the URL left `url`) or one of messages appeared that was not
+    visible before the click
+    """
+    stale = EC.staleness_of(button)
+    return lambda driver: (
+        stale(driver) or driver.current_url != url
+        or new_message(visible_text(driver), before, messages) is not None
+    )
+
+def select_has_option(locator, value=None, text=None):
+    """Wait condition: a <select> has been populated with the given option"""
+    def populated(driver):
+        options = Select(driver.find_element(*locator)).options
+        return any(
+            (value is None or option.get_attribute("value") == value) and
+            (text is None or option.text.strip() == text)
+            for option in options
+        )
+    return populated
+
+def wait_report(automators) -> Dict[str, Any]:
+    """
+    Per site and step, time spent in JobAutomator.wait_for vs. the fixed
+    sleeps those waits replaced, summed over `automators`
+    """
+    timings, applications = {}, {}
+    for automator in automators:
+        for site, count in automator.applications.items():
+            applications[site] = applications.get(site, 0) + count
+        for site, steps in automator.wait_timings.items():
+            for name, step in steps.items():
+                total = timings.setdefault(site, {}).setdefault(
+                    name, {"count": 0, "waited": 0.0, "replaced_sleep": 0.0}
+                )
+                for key in total:
+                    total[key] += step[key]
+
+    report = {}
+    for site, steps in timings.items():
+        waited = sum(step["waited"] for step in steps.values())
+        saved = sum(step["replaced_sleep"] for step in steps.values()) - waited
+        count = applications.get(site, 0)
+        report[site] = {
+            "applications": count,
+            "waited": round(waited, 2),
+            "saved": round(saved, 2),
+            "saved_per_application": round(saved / count, 2) if count else None,
+            "steps": {
+                name: {
+                    "count": step["count"],
+                    "avg_wait": round(step["waited"] / step["count"], 2),
+                    "avg_saved": round((step["replaced_sleep"] - step["waited"]) / step["count"], 2)
+                }
+                for name, step in steps.items()
+            }
+        }
+    return report
+
+def log_wait_report(report):
+    for site, waits in report.items():
+        logging.info(
+            f"{site} waits - {waits['waited']}s waited, {waits['saved']}s saved vs. fixed sleeps "
+            f"({waits['saved_per_application']}s per application)"
+        )
+
 class JobAutomator:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile_dir: Optional[str] = None):
         # Use undetected-chromedriver instead of regular ChromeDriver
         # Initialize Chrome options
         options = uc.ChromeOptions()
@@ -83,8 +187,9 @@ class JobAutomator:
         options.add_argument('--enable-automation')
         options.add_argument('--disable-blink-features=AutomationControlled')
         
-        # Initialize the driver with the options
-        self.driver = uc.Chrome(options=options)
+        # Initialize the driver with the options; a profile directory keeps
+        # this browser's cookies and logins apart from other workers
+        self.driver = uc.Chrome(options=options, user_data_dir=profile_dir)
         
                 
         # Apply stealth settings
@@ -119,39 +224,16 @@ class JobAutomator:
             "languages": ["Arabe", "Français", "Anglais"]
         }
         self.applied_jobs = get_applied_job_links()
-        self.stats = {
-            'optioncarriere': {'attempts': 0, 'successes': 0},
-            'tanitjobs': {'attempts': 0, 'successes': 0},
-            'tunisietravail': {'attempts': 0, 'successes': 0},
-            'keejob': {'attempts': 0, 'successes': 0}
-        }
+        # site -> step -> {count, waited, replaced_sleep}; see get_wait_report
+        self.wait_timings: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.applications: Dict[str, int] = {}
         self.start_time = datetime.now()
 
     def get_unapplied_jobs(self) -> List[Tuple[int, str, str]]:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        try:
-            c.execute("""
-                SELECT id, link, title 
-                FROM jobs 
-                WHERE status = 'new' 
-                AND (link LIKE '%tunisietravail.net%' 
-                    OR link LIKE '%keejob.com%'
-                    OR link LIKE '%optioncarriere.tn%'
-                    OR link LIKE '%tanitjobs.com%')
-                AND (application_success IS NULL OR application_success = 0)
-                AND (application_attempts < 3)  
-                AND is_clicked = 0
-                AND link NOT IN (
-                    SELECT link FROM jobs 
-                    WHERE status = 'applied' 
-                    AND application_success = 1
-                )
-            """)
-            jobs = c.fetchall()
-            return jobs
-        finally:
-            conn.close()
+        c = get_connection().cursor()
+        c.execute(UNAPPLIED_JOBS_QUERY, UNAPPLIED_JOBS_PARAMS)
+        jobs = c.fetchall()
+        return jobs
 
     def get_site_type(self, url: str) -> str:
             if "tunisietravail.net" in url:
@@ -163,16 +245,55 @@ class JobAutomator:
             elif "tanitjobs.com" in url:
                 return "tanitjobs"
             return "unknown"
-        
-        
-    def update_application_stats(self, site_type: str, success: bool):
-        self.stats[site_type]['attempts'] += 1
-        if success:
-            self.stats[site_type]['successes'] += 1
 
 
 
+
+    def wait_for(self, site: str, step: str, condition, replaced_sleep: float, timeout: float = STEP_TIMEOUT):
+        """
+        Wait until condition(driver) holds instead of sleeping a fixed
+        `replaced_sleep` seconds, and record how long it took. Like the sleep
+        it replaces it never fails the flow: on timeout the next explicit
+        WebDriverWait decides.
+        """
+        started = time.monotonic()
+        try:
+            WebDriverWait(
+                self.driver, timeout, poll_frequency=WAIT_POLL_INTERVAL,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(condition)
+        except TimeoutException:
+            logging.warning(f"{site}: '{step}' not reached after {timeout}s, continuing")
+        finally:
+            timing = self.wait_timings.setdefault(site, {}).setdefault(
+                step, {"count": 0, "waited": 0.0, "replaced_sleep": 0.0}
+            )
+            timing["count"] += 1
+            timing["waited"] += time.monotonic() - started
+            timing["replaced_sleep"] += replaced_sleep
+
+    def wait_for_page(self, site: str, step: str, replaced_sleep: float, timeout: float = PAGE_TIMEOUT):
+        """Wait for document.readyState == complete and NETWORK_QUIET_SECONDS without new requests"""
+        quiet = {"requests": -1, "since": 0.0}
+
+        def settled(driver):
+            if driver.execute_script("return document.readyState") != "complete":
+                return False
+            requests_made = driver.execute_script("return performance.getEntriesByType('resource').length")
+            now = time.monotonic()
+            if requests_made != quiet["requests"]:
+                quiet.update(requests=requests_made, since=now)
+                return False
+            return now - quiet["since"] >= NETWORK_QUIET_SECONDS
+
+        self.wait_for(site, step, settled, replaced_sleep, timeout)
+
+    def get_wait_report(self) -> Dict[str, Any]:
+        return wait_report([self])
+
     def apply_to_job(self, job_url: str) -> bool:
+        site = self.get_site_type(job_url)
+        self.applications[site] = self.applications.get(site, 0) + 1
         try:
             if "tunisietravail.net" in job_url:
                 return self.apply_to_tunisie_travail(job_url)
@@ -193,7 +314,7 @@ class JobAutomator:
         try:
             logging.info(f"Starting application process for OptionCarriere job: {job_url}")
             self.driver.get(job_url)
-            time.sleep(3)
+            self.wait_for_page("optioncarriere", "open job", 3)
 
             # Look for the Postuler button
             apply_button = WebDriverWait(self.driver, 10).until(
@@ -207,7 +328,7 @@ class JobAutomator:
             
             # Get the application URL
             self.driver.get(application_url)
-            time.sleep(2)
+            self.wait_for_page("optioncarriere", "open application", 2)
 
             # Check if we're on the alert setup page
             if "alert" in self.driver.current_url:
@@ -231,7 +352,7 @@ class JobAutomator:
                         
                         logging.info(f"Redirecting to cleaned URL: {direct_access_url}")
                         self.driver.get(direct_access_url)
-                        time.sleep(2)
+                        self.wait_for_page("optioncarriere", "skip alert", 2)
                 except Exception as e:
                     logging.error(f"Error handling alert page: {str(e)}")
                     return False
@@ -251,7 +372,10 @@ class JobAutomator:
                     ))
                 )
                 continue_button.click()
-                time.sleep(2)
+                self.wait_for(
+                    "optioncarriere", "email step",
+                    EC.visibility_of_element_located((By.ID, "password")), 2
+                )
                 logging.info("Clicked continue after email")
 
                 password_input = WebDriverWait(self.driver, 10).until(
@@ -267,7 +391,10 @@ class JobAutomator:
                     ))
                 )
                 login_button.click()
-                time.sleep(3)
+                self.wait_for(
+                    "optioncarriere", "login",
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "a.btn.btn-primary.btn-r.btn-next.btn-full")), 3
+                )
                 logging.info("Completed login process")
 
             except Exception as login_error:
@@ -314,12 +441,16 @@ class JobAutomator:
             
             # Navigate to the job URL
             self.driver.get(job_url)
-            time.sleep(5)  # Wait for Cloudflare check
-            
-            # Handle Cloudflare if needed
-            if "checking your browser" in self.driver.page_source.lower():
-                logging.info("Detected Cloudflare check, waiting for bypass...")
-                time.sleep(10)
+
+            # Cloudflare's check page replaces itself with the job page once
+            # it passes; wait for exactly that instead of a fixed 5-15 s
+            self.wait_for(
+                "tanitjobs", "cloudflare check",
+                lambda driver: "checking your browser" not in driver.page_source.lower()
+                and driver.execute_script("return document.readyState") == "complete",
+                5 + 10 if "checking your browser" in self.driver.page_source.lower() else 5,
+                timeout=CLOUDFLARE_TIMEOUT
+            )
             
             # Verify we're on the correct page
             if not any(keyword in self.driver.current_url for keyword in ["tanitjobs.com/job/", "tanitjobs.com/apply-now"]):
@@ -336,7 +467,12 @@ class JobAutomator:
                 )
                 apply_button.click()
                 logging.info("Clicked apply button")
-                time.sleep(2)
+                self.wait_for(
+                    "tanitjobs", "open apply form",
+                    lambda driver: "login-form" in driver.page_source
+                    or driver.find_element(By.ID, "apply-modal").is_displayed(),
+                    2
+                )
             except Exception as apply_error:
                 logging.error(f"Error clicking apply button: {str(apply_error)}")
                 return False
@@ -360,7 +496,7 @@ class JobAutomator:
                         EC.element_to_be_clickable((By.ID, "bouton-con"))
                     )
                     login_button.click()
-                    time.sleep(3)
+                    self.wait_for("tanitjobs", "login", EC.staleness_of(login_button), 3)
                     logging.info("Completed login process")
 
                     # Click apply button again after login
@@ -371,7 +507,10 @@ class JobAutomator:
                         ))
                     )
                     apply_button.click()
-                    time.sleep(2)
+                    self.wait_for(
+                        "tanitjobs", "open apply form after login",
+                        EC.visibility_of_element_located((By.ID, "apply-modal")), 2
+                    )
                     logging.info("Clicked apply button after login")
                     
                 except Exception as login_error:
@@ -428,20 +567,23 @@ class JobAutomator:
                             "input.btn__submit-modal.btn.btn__orange.btn__bold"
                         ))
                     )
+                    success_indicators = [
+                        "candidature envoyée", "votre candidature a été envoyée", "succès"
+                    ]
+                    form_url = self.driver.current_url
+                    before = visible_text(self.driver)
                     submit_button.click()
                     logging.info("Clicked submit button")
-                    time.sleep(5)
+                    self.wait_for(
+                        "tanitjobs", "submit",
+                        form_submitted(submit_button, form_url, before, success_indicators), 5
+                    )
                 except Exception as submit_error:
                     logging.error(f"Error submitting application: {str(submit_error)}")
                     return False
 
-                # Check for success
-                success_indicators = [
-                    "succès", "success", "merci", "candidature envoyée",
-                    "votre candidature a été envoyée"
-                ]
-                page_source = self.driver.page_source.lower()
-                success = any(indicator in page_source for indicator in success_indicators)
+                # Check for a confirmation the form page did not already show
+                success = new_message(visible_text(self.driver), before, success_indicators) is not None
                 
                 if success:
                     logging.info(f"Successfully applied to job at {job_url}")
@@ -475,7 +617,7 @@ class JobAutomator:
         try:
         # Visit job listing page
             self.driver.get(job_url)
-            time.sleep(3)
+            self.wait_for_page("tunisietravail", "open job", 3)
 
             # Find and click the application button
             apply_button = WebDriverWait(self.driver, 10).until(
@@ -486,7 +628,7 @@ class JobAutomator:
             )
             application_url = apply_button.get_attribute('href')
             self.driver.get(application_url)
-            time.sleep(3)
+            self.wait_for_page("tunisietravail", "open application", 3)
 
             # Fill personal info with explicit waits
             WebDriverWait(self.driver, 10).until(
@@ -501,7 +643,10 @@ class JobAutomator:
             # Location - Tunisia and Ariana
             country_select = Select(self.driver.find_element(By.ID, "country_selector"))
             country_select.select_by_value("1")  # Value for Tunisia
-            time.sleep(2)  # Wait for region dropdown to populate
+            self.wait_for(
+                "tunisietravail", "region dropdown",
+                select_has_option((By.ID, "region_selector"), text="Ariana"), 2
+            )
             
             region_select = Select(self.driver.find_element(By.ID, "region_selector"))
             region_select.select_by_visible_text("Ariana")
@@ -510,7 +655,10 @@ class JobAutomator:
             WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "diplome_oui"))
             ).click()
-            time.sleep(1)
+            self.wait_for(
+                "tunisietravail", "diploma details",
+                EC.visibility_of_element_located((By.ID, "u_diplome_detail")), 1
+            )
             
             diploma_select = Select(WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "u_diplome_detail"))
@@ -581,21 +729,25 @@ class JobAutomator:
             submit_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "submitBtn"))
             )
+            success_indicators = ["succès", "merci", "reçu"]
+            error_indicators = ["erreur", "invalide", "échec"]
+            form_url = self.driver.current_url
+            before = visible_text(self.driver)
             submit_button.click()
 
-            # Wait for success/error message
-            time.sleep(5)
-            
-            # Check for success indicators in the response
-            success_indicators = ["succès", "success", "merci", "reçu"]
-            error_indicators = ["erreur", "error", "invalide", "échec"]
+            # Wait for the form to be sent: a new page or a new result message
+            self.wait_for(
+                "tunisietravail", "submit",
+                form_submitted(submit_button, form_url, before, success_indicators + error_indicators), 5
+            )
             
-            page_source = self.driver.page_source.lower()
+            # Check for result messages the form page did not already show
+            page_text = visible_text(self.driver)
             
-            if any(indicator in page_source for indicator in success_indicators):
+            if new_message(page_text, before, success_indicators):
                 print(f"Successfully applied to {job_url}")
                 return True
-            elif any(indicator in page_source for indicator in error_indicators):
+            elif new_message(page_text, before, error_indicators):
                 print(f"Failed to apply to {job_url} - Form submission error")
                 return False
             else:
@@ -622,14 +774,19 @@ class JobAutomator:
         try:
             # Navigate to job listing
             self.driver.get(job_url)
-            time.sleep(3)
+            self.wait_for_page("keejob", "open job", 3)
 
             # Find and click the application button
             postuler_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "input#postuler_button.btn[value='Postuler']"))
             )
             postuler_button.click()
-            time.sleep(2)
+            self.wait_for(
+                "keejob", "open apply form",
+                lambda driver: "login" in driver.current_url or "connexion" in driver.current_url
+                or driver.find_element(By.CSS_SELECTOR, "select.span8[ng-model='data.country']"),
+                2
+            )
 
             # Check if we need to login
             if "login" in self.driver.current_url or "connexion" in self.driver.current_url:
@@ -649,7 +806,7 @@ class JobAutomator:
                 # Click login button
                 login_button = self.driver.find_element(By.CSS_SELECTOR, "button.btn")
                 login_button.click()
-                time.sleep(3)
+                self.wait_for("keejob", "login", EC.staleness_of(login_button), 3)
 
                 # After login, we might need to navigate back to job URL and click postuler again
                 if "postuler" not in self.driver.current_url:
@@ -658,7 +815,10 @@ class JobAutomator:
                         EC.element_to_be_clickable((By.CSS_SELECTOR, "input#postuler_button.btn[value='Postuler']"))
                     )
                     postuler_button.click()
-                    time.sleep(2)
+                    self.wait_for(
+                        "keejob", "open apply form after login",
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "select.span8[ng-model='data.country']")), 2
+                    )
 
             # Now we should be on the application form
             
@@ -667,12 +827,18 @@ class JobAutomator:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "select.span8[ng-model='data.country']"))
             ))
             country_select.select_by_value("184")  # Tunisia
-            time.sleep(1)
+            self.wait_for(
+                "keejob", "region dropdown",
+                select_has_option((By.CSS_SELECTOR, "select.span8[ng-model='data.region']"), value="0"), 1
+            )
 
             # Select Ariana as region (value 0)
             region_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select.span8[ng-model='data.region']"))
             region_select.select_by_value("0")  # Ariana
-            time.sleep(1)
+            self.wait_for(
+                "keejob", "phone country",
+                EC.presence_of_element_located((By.CSS_SELECTOR, "select[ng-model='phoneNumbers[0].country']")), 1
+            )
 
             # Verify Tunisia is selected for phone country code
             phone_country_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[ng-model='phoneNumbers[0].country']"))
@@ -690,13 +856,14 @@ class JobAutomator:
             submit_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "input#apply_button.btn.span12[value='Valider']"))
             )
+            success_text = ["candidature a été envoyée", "candidature envoyée", "succès", "merci"]
+            form_url = self.driver.current_url
+            before = visible_text(self.driver)
             submit_button.click()
-            time.sleep(5)
+            self.wait_for("keejob", "submit", form_submitted(submit_button, form_url, before, success_text), 5)
 
-            # Verify submission by looking for success indicators
-            success_text = ["succès", "success", "Merci", "candidature"]
-            page_text = self.driver.page_source.lower()
-            return any(text in page_text for text in success_text)
+            # Verify submission by a confirmation the form page did not already show
+            return new_message(visible_text(self.driver), before, success_text) is not None
     
         except Exception as e:
             print(f"Error applying to Keejob position {job_url}: {str(e)}")
@@ -706,7 +873,6 @@ class JobAutomator:
         record_application_attempt(job_id, success, site_type, error_message)
         if success:
             self.applied_jobs.add(job_link)
-        self.update_application_stats(site_type, success)
 
     def run_automation(self):
         jobs = self.get_unapplied_jobs()
@@ -748,9 +914,11 @@ class JobAutomator:
         logging.info(f"Total jobs processed: {total_jobs}")
         logging.info(f"Successful applications: {successful_applications}")
         logging.info(f"Failed applications: {failed_applications}")
+        log_wait_report(self.get_wait_report())
         
-        # Log stats by site
-        for site, stats in self.stats.items():
+        # Log stats by site (persisted, so they survive restarts)
+        site_stats = (get_application_stats() or {}).get('by_site', {})
+        for site, stats in site_stats.items():
             logging.info(f"{site} stats - Attempts: {stats['attempts']}, Successes: {stats['successes']}")
 
     def get_run_time(self) -> str:
@@ -758,8 +926,9 @@ class JobAutomator:
 
     def get_stats(self) -> Dict[str, Any]:
         stats = get_application_stats()
-        stats['site_stats'] = self.stats
+        stats['site_stats'] = stats['by_site']
         stats['running_since'] = self.start_time.strftime("%Y-%m-%d %H:%M:%S")
+        stats['wait_report'] = self.get_wait_report()
         return stats
 
     def close(self):
@@ -768,15 +937,286 @@ class JobAutomator:
         except Exception as e:
             logging.error(f"Error closing WebDriver: {str(e)}")
 
+# Browser workers and per-site throttles for AutomationPool. optioncarriere
+# hands applications over to tanitjobs, so the two share one throttle.
+AUTOMATION_WORKERS = int(os.environ.get("AUTOMATION_WORKERS", 3))
+BROWSER_PROFILE_ROOT = "browser_profiles"
+SITE_THROTTLE_GROUPS = {
+    "keejob": "keejob",
+    "optioncarriere": "tanitjobs",
+    "tanitjobs": "tanitjobs",
+    "tunisietravail": "tunisietravail"
+}
+SITE_CONCURRENCY = {"keejob": 1, "tanitjobs": 1, "tunisietravail": 1}
+# Minimum seconds between two applications on the same site
+SITE_MIN_INTERVAL = 2
+
+class AutomationPool:
+    """
+    N JobAutomator workers, each with its own browser profile, applying in
+    parallel. Jobs are queued per throttle group and a worker only takes a
+    job from a group that is under its SITE_CONCURRENCY limit, so different
+    sites proceed side by side while each one is paced on its own.
+    Exposes the same run_automation/get_stats/close interface as
+    JobAutomator.
+    """
+
+    def __init__(self, db_path: str, workers: int = AUTOMATION_WORKERS):
+        self.db_path = db_path
+        self.start_time = datetime.now()
+        self.workers = []
+        # undetected_chromedriver patches its driver binary on start, so
+        # browsers are launched one after another
+        for index in range(workers):
+            profile_dir = os.path.abspath(os.path.join(BROWSER_PROFILE_ROOT, f"worker-{index}"))
+            os.makedirs(profile_dir, exist_ok=True)
+            self.workers.append(JobAutomator(db_path, profile_dir=profile_dir))
+        self.applied_jobs = get_applied_job_links()
+        self._cond = threading.Condition()
+        self._queues = {group: deque() for group in SITE_CONCURRENCY}
+        self._active = dict.fromkeys(SITE_CONCURRENCY, 0)
+        self._next_slot = dict.fromkeys(SITE_CONCURRENCY, 0.0)
+        self._results = {"successful": 0, "failed": 0}
+
+    def get_unapplied_jobs(self) -> List[Tuple[int, str, str]]:
+        return get_connection().execute(UNAPPLIED_JOBS_QUERY, UNAPPLIED_JOBS_PARAMS).fetchall()
+
+    def _next_job(self):
+        """Claim a queued job from a group with a free slot; None when all queues are empty"""
+        with self._cond:
+            while True:
+                for group, jobs in self._queues.items():
+                    if jobs and self._active[group] < SITE_CONCURRENCY[group]:
+                        self._active[group] += 1
+                        return group, jobs.popleft()
+                if not any(self._queues.values()):
+                    return None
+                self._cond.wait()
+
+    def _wait_for_slot(self, group):
+        """Pace applications on one site to SITE_MIN_INTERVAL apart"""
+        with self._cond:
+            start = max(time.monotonic(), self._next_slot[group])
+            self._next_slot[group] = start + SITE_MIN_INTERVAL
+        time.sleep(max(0.0, start - time.monotonic()))
+
+    def _release(self, group, success):
+        with self._cond:
+            self._active[group] -= 1
+            self._results["successful" if success else "failed"] += 1
+            self._cond.notify_all()
+
+    def _work(self, worker: JobAutomator):
+        while True:
+            claimed = self._next_job()
+            if claimed is None:
+                return
+            group, (job_id, job_url, job_title) = claimed
+            success = False
+            try:
+                self._wait_for_slot(group)
+                logging.info(f"[{threading.current_thread().name}] Attempting to apply to: {job_title}")
+                site_type = worker.get_site_type(job_url)
+                success = worker.apply_to_job(job_url)
+                if success:
+                    logging.info(f"Successfully applied to: {job_title}")
+                else:
+                    logging.warning(f"Failed to apply to: {job_title}")
+                worker.mark_job_applied(job_id, job_url, success, site_type)
+            except Exception as e:
+                error_msg = str(e)
+                logging.error(f"Error processing job {job_title}: {error_msg}")
+                worker.mark_job_applied(job_id, job_url, False, worker.get_site_type(job_url), error_msg)
+            finally:
+                if success:
+                    self.applied_jobs.add(job_url)
+                self._release(group, success)
+
+    def run_automation(self):
+        jobs = self.get_unapplied_jobs()
+        total_jobs = len(jobs)
+        logging.info(f"Found {total_jobs} unapplied jobs, {len(self.workers)} browser workers")
+
+        self._results = {"successful": 0, "failed": 0}
+        with self._cond:
+            for job_id, job_url, job_title in jobs:
+                if job_url in self.applied_jobs:
+                    logging.info(f"Skipping already applied job: {job_title}")
+                    continue
+                group = SITE_THROTTLE_GROUPS.get(site_from_link(job_url))
+                if group:
+                    self._queues[group].append((job_id, job_url, job_title))
+
+        threads = [
+            threading.Thread(target=self._work, args=(worker,), name=f"browser-{index}", daemon=True)
+            for index, worker in enumerate(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Log summary
+        logging.info("\nAutomation Run Summary:")
+        logging.info(f"Total jobs processed: {total_jobs}")
+        logging.info(f"Successful applications: {self._results['successful']}")
+        logging.info(f"Failed applications: {self._results['failed']}")
+        log_wait_report(wait_report(self.workers))
+
+        site_stats = (get_application_stats() or {}).get('by_site', {})
+        for site, stats in site_stats.items():
+            logging.info(f"{site} stats - Attempts: {stats['attempts']}, Successes: {stats['successes']}")
+
+    def get_run_time(self) -> str:
+        return str(datetime.now() - self.start_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = get_application_stats()
+        stats['site_stats'] = stats['by_site']
+        stats['running_since'] = self.start_time.strftime("%Y-%m-%d %H:%M:%S")
+        stats['workers'] = len(self.workers)
+        stats['queued'] = {group: len(jobs) for group, jobs in self._queues.items()}
+        stats['wait_report'] = wait_report(self.workers)
+        return stats
+
+    def close(self):
+        with self._cond:
+            # Workers stop once the job they are on is finished
+            for jobs in self._queues.values():
+                jobs.clear()
+            self._cond.notify_all()
+        for worker in self.workers:
+            worker.close()
+
 # FastAPI App Configuration
 # Global variables
 automator = None
 automation_thread = None
 automation_start_time = None
+rescore_thread = None
+
+# Blocking SQLite work from async handlers runs here, never on the event
+# loop; each worker thread keeps its own shared connection (get_connection)
+DB_EXECUTOR_WORKERS = 4
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Await func(*args, **kwargs) on the DB executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(func, *args, **kwargs))
+
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+class ResponseCache:
+    """
+    Bodies of read-only responses, keyed by request and tagged with the DB
+    change counter they were built at. An entry is only served while the
+    counter is unchanged, so writers never have to invalidate anything.
+    """
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, version, body, media_type, headers):
+        # Don't let one huge page push out every other entry
+        if len(body) > self.max_bytes // 8:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.size -= len(old[1])
+            self.entries[key] = (version, body, media_type, headers)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted[1])
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified
+            }
+
+response_cache = ResponseCache()
+
+# Part of every ETag: tags handed out before a restart (new code, new
+# keyword lists) must not validate against this process
+CACHE_PROCESS_TOKEN = f"{os.getpid()}-{time.time_ns()}"
+
+def get_cache_version():
+    """(change counter, SQLite schema version): a migration also invalidates"""
+    schema_version = get_connection().execute("PRAGMA schema_version").fetchone()[0]
+    return get_data_version(), schema_version
+
+async def cached_response(request: Request, build, state=()):
+    """
+    Serve `build()` (async, returning a Response) through response_cache.
+    The ETag is derived from the process, the change counter and schema
+    version, the URL and `state` (any non-DB input), so a matching
+    If-None-Match gets a 304 before anything is built. Only for responses
+    that depend on nothing else.
+    """
+    version = await run_db(get_cache_version)
+    key = (request.url.path, request.url.query, *state)
+    etag = '"' + hashlib.sha1(repr((CACHE_PROCESS_TOKEN, version, key)).encode()).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in if_none_match or "*" in if_none_match:
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    entry = response_cache.get(key, version)
+    if entry:
+        _, body, media_type, extra_headers = entry
+        return Response(content=body, media_type=media_type, headers={**extra_headers, **headers})
+
+    response = await build()
+    if response.status_code != 200:
+        return response
+    response.headers.update(headers)
+    extra_headers = {name: value for name, value in response.headers.items() if name.startswith("x-")}
+
+    if isinstance(response, StreamingResponse):
+        # Keep streaming to the client; store the body once it is complete
+        body_iterator = response.body_iterator
+
+        async def tee():
+            chunks = []
+            async for chunk in body_iterator:
+                chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode(response.charset))
+                yield chunk
+            response_cache.put(key, version, b"".join(chunks), response.media_type, extra_headers)
+
+        response.body_iterator = tee()
+    else:
+        response_cache.put(key, version, response.body, response.media_type, extra_headers)
+    return response
 
 def get_db_connection():
+    """This thread's shared WAL-mode connection; handlers must not close it"""
     try:
-        return sqlite3.connect(DB_FILE)
+        return get_connection()
     except sqlite3.Error as e:
         logging.error(f"Database connection error: {e}")
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -792,18 +1232,22 @@ def lifespan(app: FastAPI):
         print("Starting job updater...")
         def update_loop():
             while True:
-                update_jobs()
+                # Does nothing if a run started from the API or the CLI is live
+                scrape_scheduler.start("schedule", wait=True)
                 print("Jobs updated. Sleeping for 24 hours...")
                 time.sleep(86400)
         thread = threading.Thread(target=update_loop, daemon=True)
         thread.start()
 
     start_job_updater()
+    # Refresh scores left stale by a keyword-list change
+    start_rescore()
     yield
     
     global automator
     if automator:
         automator.close()
+    db_executor.shutdown(wait=False)
     print("Shutting down application.")
 
 app = FastAPI(lifespan=lifespan)
@@ -814,6 +1258,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 @app.on_event("startup")
@@ -833,91 +1278,280 @@ async def shutdown_event():
 def read_root():
     return JSONResponse({"message": "Welcome to the Job Scraper API!"})
 
-@app.post("/mark-job-clicked")
-def mark_job_clicked(job_data: dict):
-    try:
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('''
+def set_job_clicked(link: str):
+    conn = get_db_connection()
+    with conn:
+        conn.execute('''
         UPDATE jobs 
         SET is_clicked = 1 
         WHERE link = ?
-        ''', (job_data['link'],))
-        conn.commit()
-        conn.close()
+        ''', (link,))
+        bump_data_version(conn)
+
+@app.post("/mark-job-clicked")
+async def mark_job_clicked(job_data: dict):
+    try:
+        await run_db(set_job_clicked, job_data['link'])
         return {"status": "success"}
     except sqlite3.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-@app.get("/jobs", response_model=List[Job])
-def get_jobs(keyword: str = None, status: str = None):
+# Columns /jobs can return; `fields=` picks a subset (e.g. without description)
+JOB_FIELDS = [
+    "id", "title", "link", "publish_date", "location", "experience",
+    "description", "status", "is_clicked", "application_attempts",
+    "last_application_date", "application_success", "relevance_score", "site"
+]
+DEFAULT_JOB_FIELDS = [field for field in JOB_FIELDS if field not in ("id", "site")]
+
+JOBS_PAGE_SIZE = 100
+JOBS_MAX_PAGE_SIZE = 1000
+JOBS_STREAM_BATCH = 200
+
+# Keyset orderings as (expression, descending) pairs; each ends in a unique
+# column so "rows after the cursor" is well defined. Nullable keys are
+# COALESCEd (matching idx_jobs_relevance_sort / idx_jobs_publish_date_sort)
+# so unscored or undated rows sort last instead of breaking the comparison.
+JOB_ORDERINGS = {
+    "id": [("jobs.id", False)],
+    "relevance": [("COALESCE(jobs.relevance_score, -1)", True), ("jobs.id", False)],
+    "date": [("COALESCE(jobs.publish_date, '')", True), ("jobs.id", True)],
+    "search": [(f"bm25(jobs_fts, {', '.join(map(str, SEARCH_COLUMN_WEIGHTS))})", False), ("jobs.id", False)]
+}
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode()
+
+def decode_cursor(cursor, size):
     try:
-        conn = get_db_connection()
-        c = conn.cursor()
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_condition(ordering, values):
+    """
+    WHERE clause selecting the rows that sort after `values`. The leading
+    `expr <= ?` bound lets SQLite seek the index instead of scanning it.
+    The expressions must never be NULL (see JOB_ORDERINGS), or the
+    comparison is NULL and pagination stops.
+    """
+    (expr, descending), rest = ordering[0], ordering[1:]
+    op = "<" if descending else ">"
+    if not rest:
+        return f"{expr} {op} ?", [values[0]]
+    condition, params = keyset_condition(rest, values[1:])
+    return (
+        f"({expr} {op}= ? AND ({expr} {op} ? OR ({expr} = ? AND {condition})))",
+        [values[0], values[0], values[0], *params]
+    )
+
+def job_record(fields, row):
+    record = dict(zip(fields, row))
+    if "is_clicked" in record:
+        record["is_clicked"] = bool(record["is_clicked"])
+    if record.get("application_success") is not None:
+        record["application_success"] = bool(record["application_success"])
+    return record
+
+@app.get("/jobs")
+async def get_jobs(
+    request: Request,
+    keyword: str = None,
+    status: str = None,
+    site: str = None,
+    sort: str = None,
+    fields: str = None,
+    limit: int = None,
+    cursor: str = None,
+    format: str = "json"
+):
+    """
+    Jobs streamed straight from the database cursor as a JSON array (or
+    NDJSON with format=ndjson). Without `limit` or `cursor` every matching
+    job is returned, as before pagination existed. With either, one page
+    (JOBS_PAGE_SIZE by default) is returned; pass the X-Next-Cursor
+    response header back as `cursor` for the next page. It is absent on
+    the last one.
+    """
+    return await cached_response(request, partial(
+        build_jobs_page, keyword, status, site, sort, fields, limit, cursor, format
+    ))
+
+async def build_jobs_page(keyword, status, site, sort, fields, limit, cursor, format):
+    selected = fields.split(",") if fields else DEFAULT_JOB_FIELDS
+    unknown = [field for field in selected if field not in JOB_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+    paginated = limit is not None or cursor is not None
+    limit = max(1, min(limit or JOBS_PAGE_SIZE, JOBS_MAX_PAGE_SIZE))
+
+    def open_page():
+        try:
+            query = " FROM jobs"
+            params = []
+
+            # Keyword search goes through the FTS5 index (accent-insensitive,
+            # BM25-ranked); LIKE is only the fallback when it is unavailable
+            search = fts_query(keyword) if keyword and search_available() else None
+            if search:
+                query += " JOIN jobs_fts ON jobs_fts.rowid = jobs.id WHERE jobs_fts MATCH ?"
+                params.append(search)
+            else:
+                query += " WHERE 1=1"
+                if keyword:
+                    query += " AND (jobs.title LIKE ? OR jobs.description LIKE ?)"
+                    params.extend([f"%{keyword}%", f"%{keyword}%"])
+
+            # status and site are served from idx_jobs_status_application / idx_jobs_site_status
+            if status:
+                query += " AND jobs.status = ?"
+                params.append(status)
+
+            if site:
+                query += " AND jobs.site = ?"
+                params.append(site)
+
+            # relevance is served from idx_jobs_relevance, date from idx_jobs_publish_date
+            if sort in ("relevance", "date"):
+                ordering = JOB_ORDERINGS[sort]
+            else:
+                ordering = JOB_ORDERINGS["search" if search else "id"]
+            if cursor:
+                condition, cursor_params = keyset_condition(ordering, decode_cursor(cursor, len(ordering)))
+                query += f" AND {condition}"
+                params.extend(cursor_params)
+            query += " ORDER BY " + ", ".join(
+                f"{expr} DESC" if descending else expr for expr, descending in ordering
+            )
 
-        query = """
-            SELECT title, link, publish_date, location, experience, 
-                   description, status, is_clicked, application_attempts,
-                   last_application_date, application_success
-            FROM jobs
-            WHERE 1=1
-        """
-        params = []
+            headers = {}
+            if paginated:
+                # Sort keys of the last row on this page, if another row follows it
+                keys = get_db_connection().execute(
+                    f"SELECT {', '.join(expr for expr, _ in ordering)}{query} LIMIT 2 OFFSET ?",
+                    params + [limit - 1]
+                ).fetchall()
+                if len(keys) == 2:
+                    headers["X-Next-Cursor"] = encode_cursor(keys[0])
+                query += " LIMIT ?"
+                params.append(limit)
+
+            # The response is iterated on the threadpool, so it gets its own
+            # connection rather than this thread's shared one
+            conn = open_connection(check_same_thread=False)
+            try:
+                rows = conn.execute(
+                    f"SELECT {', '.join(f'jobs.{field}' for field in selected)}{query}", params
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            return headers, conn, rows
+        except sqlite3.Error as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-        if keyword:
-            query += " AND (title LIKE ? OR description LIKE ?)"
-            params.extend([f"%{keyword}%", f"%{keyword}%"])
+    headers, conn, rows = await run_db(open_page)
 
-        if status:
-            query += " AND status = ?"
-            params.append(status)
+    def serialize():
+        try:
+            first = True
+            if format == "json":
+                yield "["
+            while True:
+                batch = rows.fetchmany(JOBS_STREAM_BATCH)
+                if not batch:
+                    break
+                chunk = [json.dumps(job_record(selected, row), ensure_ascii=False) for row in batch]
+                if format == "ndjson":
+                    yield "".join(line + "\n" for line in chunk)
+                else:
+                    yield ("" if first else ",") + ",".join(chunk)
+                first = False
+            if format == "json":
+                yield "]"
+        finally:
+            conn.close()
 
-        c.execute(query, params)
-        jobs = c.fetchall()
-        conn.close()
-
-        return [
-            {
-                "title": row[0],
-                "link": row[1],
-                "publish_date": row[2],
-                "location": row[3],
-                "experience": row[4],
-                "description": row[5],
-                "status": row[6],
-                "is_clicked": bool(row[7]),
-                "application_attempts": row[8],
-                "last_application_date": row[9],
-                "application_success": bool(row[10]) if row[10] is not None else None
-            }
-            for row in jobs
-        ]
-    except sqlite3.Error as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    # The generator's finally only runs if it was started; the background
+    # task closes the connection once the response is done either way
+    return StreamingResponse(
+        serialize(), media_type=media_type, headers=headers, background=BackgroundTask(conn.close)
+    )
 
 @app.get("/keywords")
-def get_keywords():
-    return {"keywords": KEYWORDS}
+async def get_keywords(request: Request):
+    async def build():
+        return JSONResponse({"keywords": KEYWORDS})
+    return await cached_response(request, build)
 
 
 @app.get("/application-stats", response_model=ApplicationStats)
-async def get_application_stats_endpoint():
-    stats = get_application_stats()
-    if not stats:
-        raise HTTPException(status_code=500, detail="Failed to retrieve application statistics")
-    return stats
-
-@app.get("/update-jobs")
-def trigger_job_update():
-    try:
-        result = update_jobs()
-        return {
-            "status": "success",
-            "message": "Jobs updated successfully",
-            "new_jobs_added": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Job update failed: {str(e)}")
+async def get_application_stats_endpoint(request: Request):
+    async def build():
+        stats = await run_db(get_application_stats)
+        if not stats:
+            raise HTTPException(status_code=500, detail="Failed to retrieve application statistics")
+        return JSONResponse(jsonable_encoder(ApplicationStats(**stats)))
+    return await cached_response(request, build)
+
+@app.get("/application-stats/daily")
+async def get_daily_application_stats_endpoint(request: Request, days: int = 30):
+    async def build():
+        trend = await run_db(get_daily_application_stats, max(1, min(days, 366)))
+        if trend is None:
+            raise HTTPException(status_code=500, detail="Failed to retrieve application statistics")
+        return JSONResponse(trend)
+    # The window moves at midnight even without a write
+    return await cached_response(request, build, state=(datetime.now().strftime("%Y-%m-%d"),))
+
+@app.api_route("/update-jobs", methods=["GET", "POST"], status_code=202)
+async def trigger_job_update(mode: Optional[str] = None):
+    if mode not in (None, "search", "discovery"):
+        raise HTTPException(status_code=400, detail="mode must be search or discovery")
+    run_id, started = await run_db(scrape_scheduler.start, "api", False, mode)
+    run = await run_db(get_scrape_run, run_id) if run_id else None
+    return {
+        "started": started,
+        "run": run,
+        "status_url": f"/scrape-runs/{run_id}" if run_id else None
+    }
+
+@app.get("/scrape-runs")
+async def get_scrape_runs(limit: int = 20):
+    return await run_db(list_scrape_runs, max(1, min(limit, 100)))
+
+@app.get("/scrape-runs/{run_id}")
+async def get_scrape_run_endpoint(run_id: int):
+    run = await run_db(get_scrape_run, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Unknown scrape run")
+    return run
+
+@app.post("/scrape-runs/{run_id}/cancel")
+async def cancel_scrape_run(run_id: int):
+    if not await run_db(scrape_scheduler.cancel, run_id):
+        raise HTTPException(status_code=409, detail="Scrape run is not running")
+    return {"status": "success", "message": "Cancellation requested"}
+
+def start_rescore(force: bool = False) -> bool:
+    global rescore_thread
+    if rescore_thread and rescore_thread.is_alive():
+        return False
+    rescore_thread = threading.Thread(target=rescore_jobs, kwargs={"force": force}, daemon=True)
+    rescore_thread.start()
+    return True
+
+@app.post("/rescore-jobs")
+def trigger_rescore(force: bool = False):
+    if not start_rescore(force):
+        raise HTTPException(status_code=409, detail="Rescore already running")
+    return {"status": "success", "message": "Rescore started in the background"}
 
 def run_automation_loop():
     global automator
@@ -937,7 +1571,7 @@ async def start_automation():
         raise HTTPException(status_code=400, detail="Automation already running")
     
     try:
-        automator = JobAutomator(DB_FILE)
+        automator = await asyncio.get_running_loop().run_in_executor(None, AutomationPool, DB_FILE)
         automation_start_time = datetime.now()
         automation_thread = threading.Thread(
             target=run_automation_loop,
@@ -957,22 +1591,27 @@ async def start_automation():
 @app.get("/automation-status", response_model=AutomationStatus)
 async def get_automation_status():
     global automator, automation_thread, automation_start_time
+    status = "running" if automation_thread and automation_thread.is_alive() else "stopped"
+    running_since = automation_start_time.strftime("%Y-%m-%d %H:%M:%S") if automation_start_time else None
+
     stats = None
     if automator:
-        stats = automator.get_stats()
-    return {
-        "status": "running" if automation_thread and automation_thread.is_alive() else "stopped",
-        "stats": stats,
-        "applied_count": get_applied_count(),
-        "running_since": automation_start_time.strftime("%Y-%m-%d %H:%M:%S") if automation_start_time else None
-    }
+        stats = await run_db(automator.get_stats)
+    # Not cached: the pool's queue and the wait report change without a
+    # data_version bump
+    return JSONResponse(jsonable_encoder(AutomationStatus(
+        status=status,
+        stats=stats,
+        applied_count=await run_db(get_applied_count),
+        running_since=running_since
+    )), headers={"Cache-Control": "no-store"})
 
 @app.post("/stop-automation")
 async def stop_automation():
     global automator, automation_thread, automation_start_time
     
     if automator:
-        automator.close()
+        await asyncio.get_running_loop().run_in_executor(None, automator.close)
         automator = None
     automation_thread = None
     automation_start_time = None
@@ -984,14 +1623,8 @@ def get_applied_count():
     try:
         conn = get_db_connection()
         c = conn.cursor()
-        c.execute("""
-        SELECT 
-        COUNT(*) as total_applications
-        FROM jobs 
-        WHERE status = 'applied'
-        """)
+        c.execute(APPLIED_COUNT_QUERY)
         row = c.fetchone()
-        conn.close()
         return row[0] if row else 0
     except sqlite3.Error:
         return 0